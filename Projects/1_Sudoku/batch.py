@@ -0,0 +1,203 @@
+"""Batch solving of Sudoku puzzles on a process pool
+
+`solve_many` streams an iterable of grid strings (or a file with one puzzle
+per line) through the bitmask engine and yields the results in input order.
+Puzzles are sent to the workers in chunks, and only a few chunks per worker are
+in flight at any time, so arbitrarily large inputs are never held in memory.
+"""
+import mmap
+import os
+import time
+from collections import deque
+from itertools import islice
+from multiprocessing import Pool
+
+import bitboard
+from topology import DIAGONAL
+
+
+class BatchStats:
+    """Throughput statistics updated by `solve_many` as results are yielded"""
+
+    def __init__(self):
+        self.puzzles = 0
+        self.solved = 0
+        self.failed = 0
+        self.start = time.perf_counter()
+        self.elapsed = 0.0
+
+    @property
+    def rate(self):
+        """Puzzles per second since the batch started"""
+        return self.puzzles / self.elapsed if self.elapsed else 0.0
+
+    def update(self, result):
+        self.puzzles += 1
+        if result:
+            self.solved += 1
+        else:
+            self.failed += 1
+        self.elapsed = time.perf_counter() - self.start
+
+    def __repr__(self):
+        return '{} puzzles ({} solved, {} failed) in {:.3f}s, {:.1f} puzzles/s'.format(
+            self.puzzles, self.solved, self.failed, self.elapsed, self.rate)
+
+
+def read_lines(path, use_mmap=False):
+    """Yield the stripped lines of a text file without reading it all at once
+
+    Parameters
+    ----------
+    path(str)
+        the path of a text file
+
+    use_mmap(bool)
+        if True, map the file into memory and split lines from the mapping
+        instead of reading it through a buffered file object
+
+    Returns
+    -------
+    generator
+        the lines of the file with surrounding whitespace removed
+    """
+    if use_mmap:
+        with open(path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                for line in iter(mm.readline, b''):
+                    yield line.decode('ascii').strip()
+    else:
+        with open(path) as f:
+            for line in f:
+                yield line.strip()
+
+
+def read_puzzles(path, use_mmap=False):
+    """Yield the puzzles in a file, one per line, skipping blank and '#' lines
+
+    Parameters
+    ----------
+    path(str)
+        the path of a text file with one 81 character grid per line
+
+    use_mmap(bool)
+        read the file through a memory map (see `read_lines`)
+
+    Returns
+    -------
+    generator
+        the grid strings in file order
+    """
+    for line in read_lines(path, use_mmap):
+        if line and not line.startswith('#'):
+            yield line
+
+
+def solve_grid(grid, topology=DIAGONAL, strategies=()):
+    """Solve a single grid with the bitmask engine
+
+    Parameters
+    ----------
+    grid(string)
+        a string representing a sudoku grid, with '.' or '0' for empty boxes
+
+    topology(Topology)
+        the units and peers of the variant to solve
+
+    strategies(sequence)
+        names of additional strategies to apply (see `bitboard.reduce_puzzle`)
+
+    Returns
+    -------
+    string or False
+        the solved grid string, or False if the puzzle has no solution
+
+    Raises
+    ------
+    ValueError
+        if the grid has the wrong length or a character that is neither a
+        digit of the topology nor a blank
+    """
+    if len(grid) != len(topology.boxes):
+        raise ValueError('expected a grid of {} boxes, got {!r}'.format(len(topology.boxes), grid))
+    if '0' not in topology.digits:
+        grid = grid.replace('0', '.')
+    board = bitboard.search(bitboard.grid2board(grid, topology), inplace=True, topology=topology,
+                            strategies=strategies)
+    if board is False:
+        return False
+    return bitboard.board2grid(board, topology)
+
+
+def _solve_chunk(grids, topology, strategies):
+    return [solve_grid(grid, topology, strategies) for grid in grids]
+
+
+def _chunks(iterable, size):
+    it = iter(iterable)
+    while True:
+        chunk = list(islice(it, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def solve_many(grids, workers=None, chunksize=256, stats=None, topology=DIAGONAL,
+               strategies=()):
+    """Solve many puzzles on a process pool, yielding the results in order
+
+    Parameters
+    ----------
+    grids(iterable or str)
+        an iterable of grid strings, or the path of a file with one grid per line
+
+    workers(int)
+        the number of worker processes (default: os.cpu_count()); with 1 the
+        puzzles are solved in the calling process
+
+    chunksize(int)
+        the number of puzzles sent to a worker at a time
+
+    stats(BatchStats)
+        if given, updated with throughput statistics as results are yielded
+
+    topology(Topology)
+        the units and peers of the variant to solve
+
+    strategies(sequence)
+        names of additional strategies to apply (see `bitboard.reduce_puzzle`)
+
+    Returns
+    -------
+    generator
+        the solved grid string (or False if there is no solution) for each input
+        grid, in input order
+    """
+    if isinstance(grids, (str, os.PathLike)):
+        grids = read_puzzles(grids)
+    workers = workers or os.cpu_count() or 1
+
+    if workers == 1:
+        results = (solve_grid(grid, topology, strategies) for grid in grids)
+    else:
+        results = _solve_pooled(grids, workers, chunksize, topology, strategies)
+
+    for result in results:
+        if stats is not None:
+            stats.update(result)
+        yield result
+
+
+def _solve_pooled(grids, workers, chunksize, topology, strategies):
+    with Pool(workers) as pool:
+        # keep a bounded number of chunks in flight so that the input is read
+        # lazily instead of being queued on the pool all at once
+        pending = deque()
+        for chunk in _chunks(grids, chunksize):
+            pending.append(pool.apply_async(_solve_chunk, (chunk, topology, strategies)))
+            if len(pending) >= 2 * workers:
+                yield from pending.popleft().get()
+        while pending:
+            yield from pending.popleft().get()
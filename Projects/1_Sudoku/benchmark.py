@@ -0,0 +1,276 @@
+"""Benchmark the Sudoku engines on the bundled puzzle corpora
+
+The puzzles/ directory holds one file per difficulty tier, with one puzzle per
+line. Every combination of tier, engine and strategy set is timed one puzzle at
+a time and reported as one row:
+
+    python benchmark.py --tiers hard 17-clue --engines bitboard dlx \
+        --strategies none all hidden_pairs,pointing_pairs \
+        --orderings mrv:ascending mrv_degree:lcv
+
+The rows show the throughput, the median and 99th percentile latency and, for
+the bitmask engine, the digits tried while branching (search nodes) and the
+candidates eliminated by propagation and the strategies per puzzle, and the
+deepest level of branching. Strategy sets and branching heuristics (variable
+and value orderings) are only compared on the bitmask engine. With --phases,
+the time spent in propagation and in each strategy is printed below each row.
+"""
+import argparse
+import os
+import time
+from collections import OrderedDict
+
+import bitboard
+import dlx
+import solution
+from batch import read_puzzles
+from ordering import VALUE_ORDERINGS, VARIABLE_ORDERINGS
+from strategies import STRATEGIES
+from topology import DIAGONAL, REGULAR
+from utils import grid2values
+
+PUZZLE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'puzzles')
+
+# the variant to solve the puzzles of each tier with
+TIERS = OrderedDict([
+    ('easy', REGULAR),
+    ('hard', REGULAR),
+    ('diagonal', DIAGONAL),
+    ('17-clue', REGULAR),
+])
+
+
+DEFAULT_ORDERING = ('mrv', 'ascending')
+
+
+def _solve_search(grid, topology, strategies, ordering, counters):
+    return solution.search(grid2values(grid), topology)
+
+
+def _solve_bitboard(grid, topology, strategies, ordering, counters):
+    variable, value = ordering
+    return bitboard.search(bitboard.grid2board(grid, topology), inplace=True, topology=topology,
+                           strategies=strategies, counters=counters, variable=variable,
+                           value=value)
+
+
+def _solve_dlx(grid, topology, strategies, ordering, counters):
+    return dlx.solve(grid, topology)
+
+
+# engine name -> solver(grid, topology, strategies, ordering, counters)
+ENGINES = OrderedDict([
+    ('search', _solve_search),
+    ('bitboard', _solve_bitboard),
+    ('dlx', _solve_dlx),
+])
+
+# the engines that apply strategies and orderings and fill in SolveStats
+COUNTING_ENGINES = frozenset(['bitboard'])
+
+
+def load_tier(tier):
+    """Return the puzzles of a difficulty tier as a list of grid strings"""
+    if tier not in TIERS:
+        raise ValueError('unknown tier {!r}, choose from {}'.format(tier, ', '.join(TIERS)))
+    return list(read_puzzles(os.path.join(PUZZLE_DIR, tier + '.txt')))
+
+
+def percentile(values, q):
+    """Return the q-th percentile (0 < q <= 100) of a list using the nearest rank"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = -(-len(ordered) * q // 100)  # ceiling without floats
+    return ordered[max(int(rank), 1) - 1]
+
+
+class BenchmarkResult:
+    """Timings and search statistics of one engine on one set of puzzles"""
+
+    def __init__(self, tier, engine, strategies, ordering=DEFAULT_ORDERING):
+        self.tier = tier
+        self.engine = engine
+        self.strategies = tuple(strategies)
+        self.ordering = tuple(ordering)
+        self.latencies = []
+        self.solved = 0
+        self.stats = bitboard.SolveStats()
+
+    @property
+    def puzzles(self):
+        return len(self.latencies)
+
+    @property
+    def elapsed(self):
+        return sum(self.latencies)
+
+    @property
+    def rate(self):
+        """Puzzles per second"""
+        return self.puzzles / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def nodes(self):
+        """Search nodes per puzzle"""
+        return self.stats['nodes'] / self.puzzles if self.puzzles else 0.0
+
+    @property
+    def eliminated(self):
+        """Candidates eliminated per puzzle by propagation and the strategies"""
+        total = sum(self.stats.eliminations.values())
+        return total / self.puzzles if self.puzzles else 0.0
+
+    def __repr__(self):
+        return '<BenchmarkResult: {} {} on {}, {} puzzles, {:.1f} puzzles/s>'.format(
+            self.engine, format_strategies(self.strategies), self.tier, self.puzzles, self.rate)
+
+
+def run_benchmark(grids, topology=REGULAR, engine='bitboard', strategies=(), tier='',
+                  ordering=DEFAULT_ORDERING):
+    """Solve every puzzle once with an engine and record how long each one takes
+
+    Parameters
+    ----------
+    grids(iterable)
+        the puzzles as grid strings
+
+    topology(Topology)
+        the units and peers of the variant to solve
+
+    engine(str)
+        one of the keys of ENGINES
+
+    strategies(sequence)
+        names of additional strategies to apply (bitboard engine only)
+
+    tier(str)
+        a label for the puzzles in the result
+
+    ordering(tuple)
+        the (variable, value) branching heuristics (bitboard engine only, see
+        `bitboard.search`)
+
+    Returns
+    -------
+    BenchmarkResult
+        the latencies, solved puzzles and search statistics of the run
+    """
+    if engine not in ENGINES:
+        raise ValueError('unknown engine {!r}, choose from {}'.format(engine, ', '.join(ENGINES)))
+    if engine not in COUNTING_ENGINES:
+        if strategies:
+            raise ValueError('the {} engine does not support strategies'.format(engine))
+        if tuple(ordering) != DEFAULT_ORDERING:
+            raise ValueError('the {} engine does not support branching heuristics'.format(engine))
+    solver = ENGINES[engine]
+    result = BenchmarkResult(tier, engine, strategies, ordering)
+    stats = result.stats if engine in COUNTING_ENGINES else None
+    for grid in grids:
+        start = time.perf_counter()
+        solved = solver(grid, topology, strategies, ordering, stats)
+        result.latencies.append(time.perf_counter() - start)
+        if solved:
+            result.solved += 1
+    return result
+
+
+def parse_strategies(text):
+    """Parse a strategy set: 'none', 'all' or comma separated strategy names"""
+    if text == 'none':
+        return ()
+    if text == 'all':
+        return tuple(STRATEGIES)
+    names = tuple(name for name in text.split(',') if name)
+    unknown = [name for name in names if name not in STRATEGIES]
+    if unknown:
+        raise ValueError('unknown strategies: {}'.format(', '.join(unknown)))
+    return names
+
+
+def parse_ordering(text):
+    """Parse a pair of branching heuristics written as 'variable:value'"""
+    variable, _, value = text.partition(':')
+    value = value or DEFAULT_ORDERING[1]
+    if variable not in VARIABLE_ORDERINGS:
+        raise ValueError('unknown variable ordering: {}'.format(variable))
+    if value not in VALUE_ORDERINGS:
+        raise ValueError('unknown value ordering: {}'.format(value))
+    return variable, value
+
+
+def format_strategies(strategies):
+    if not strategies:
+        return 'none'
+    if tuple(strategies) == tuple(STRATEGIES):
+        return 'all'
+    return ','.join(strategies)
+
+
+HEADER = ('tier', 'engine', 'strategies', 'ordering', 'puzzles', 'solved', 'puzzles/s',
+          'p50 ms', 'p99 ms', 'nodes', 'eliminated', 'depth')
+ROW_FORMAT = '{:<10}{:<10}{:<16}{:<22}{:>8}{:>8}{:>11}{:>9}{:>9}{:>9}{:>12}{:>7}'
+
+
+def format_result(result):
+    """Format a result as one row of the benchmark table"""
+    if result.engine in COUNTING_ENGINES:
+        nodes, eliminated = '{:.1f}'.format(result.nodes), '{:.0f}'.format(result.eliminated)
+        depth = result.stats['max_depth']
+    else:
+        nodes = eliminated = depth = '-'
+    return ROW_FORMAT.format(result.tier, result.engine, format_strategies(result.strategies),
+                             ':'.join(result.ordering), result.puzzles, result.solved,
+                             '{:.1f}'.format(result.rate),
+                             '{:.2f}'.format(percentile(result.latencies, 50) * 1000),
+                             '{:.2f}'.format(percentile(result.latencies, 99) * 1000),
+                             nodes, eliminated, depth)
+
+
+def format_phases(result):
+    """Format the share of the search time spent in each phase of a result"""
+    times = result.stats.times
+    total = times['total']
+    if not total:
+        return ''
+    phases = sorted((t, phase) for phase, t in times.items() if phase != 'total')
+    branching = total - sum(t for t, _ in phases)
+    fields = ['{} {:.0%}'.format(phase, t / total) for t, phase in reversed(phases)]
+    return '    phases: ' + ', '.join(fields + ['branching {:.0%}'.format(branching / total)])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the Sudoku engines and strategy " +
+        "sets on the bundled puzzle corpora.")
+    parser.add_argument('-t', '--tiers', nargs='+', choices=list(TIERS), default=list(TIERS),
+                        help="Difficulty tiers to run (default: all).")
+    parser.add_argument('-e', '--engines', nargs='+', choices=list(ENGINES),
+                        default=list(ENGINES), help="Engines to compare (default: all).")
+    parser.add_argument('-s', '--strategies', nargs='+', type=parse_strategies, default=[()],
+                        metavar='SET',
+                        help="Strategy sets to compare on the bitboard engine: 'none', 'all' or " +
+                        "a comma separated list of names from: {}".format(", ".join(STRATEGIES)))
+    parser.add_argument('-o', '--orderings', nargs='+', type=parse_ordering,
+                        default=[DEFAULT_ORDERING], metavar='VARIABLE:VALUE',
+                        help="Branching heuristics to compare on the bitboard engine, e.g. " +
+                        "mrv_degree:lcv. Variable orderings: {}; value orderings: {}.".format(
+                            ", ".join(VARIABLE_ORDERINGS), ", ".join(VALUE_ORDERINGS)))
+    parser.add_argument('-n', '--limit', type=int, default=None,
+                        help="Only run the first LIMIT puzzles of each tier.")
+    parser.add_argument('--phases', action='store_true',
+                        help="Print the share of time spent in each phase of the bitboard search.")
+    args = parser.parse_args()
+
+    print(ROW_FORMAT.format(*HEADER))
+    for tier in args.tiers:
+        grids = load_tier(tier)[:args.limit]
+        for engine in args.engines:
+            if engine in COUNTING_ENGINES:
+                runs = [(s, o) for s in args.strategies for o in args.orderings]
+            else:
+                runs = [((), DEFAULT_ORDERING)]
+            for strategies, ordering in runs:
+                result = run_benchmark(grids, TIERS[tier], engine, strategies, tier, ordering)
+                print(format_result(result))
+                if args.phases and engine in COUNTING_ENGINES:
+                    print(format_phases(result))
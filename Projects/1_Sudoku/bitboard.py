@@ -0,0 +1,781 @@
+"""Bitmask-based Sudoku engine
+
+This module implements the same strategies as `solution.py`, but every box is
+stored as an N-bit integer in a flat list of N * N slots instead of a string in
+a dictionary keyed by box name. Bit k of a slot is set while the k-th digit of
+the topology is still a candidate for that box, so '123456789' becomes
+0b111111111 on a 9x9 board and a solved box has exactly one bit set.
+
+Units, peers and digits come from a `topology.Topology`, with units and peers
+as tuples of slot indices, so the strategies work with integer arithmetic only
+and the same code solves 9x9, 16x16 and 25x25 boards. Every function takes the
+topology of the variant to solve (9x9 diagonal sudoku by default). Use
+`values2board` and `board2values` to convert between this representation and
+the dictionary form used in the rest of the project.
+
+`reduce_puzzle` and `search` do not sweep the whole board: `propagate` keeps a
+worklist of the boxes that changed and of the units that contain them, so each
+assignment only revisits the peers and units it can affect. With
+``search(board, inplace=True)`` a single board is mutated for the whole search
+and every change is recorded on a trail, so backtracking restores the previous
+state with `undo` instead of copying the board at every branch.
+
+The advanced strategies in `strategies.py` (hidden pairs, pointing pairs,
+X-wing, ...) can be added to `reduce_puzzle`, `search` and `solve` by name, in
+any order; they only run when propagation stalls. Pass a `collections.Counter`
+as `counters` to count the candidates eliminated by each strategy (and, in
+`search` and `count_solutions`, the branches tried under 'nodes'), or a
+`SolveStats` to also record the search depth, backtracks and the time spent in
+each phase. Without either, no bookkeeping is done at all.
+
+`search` and `count_solutions` branch on the box with the fewest candidates and
+try its digits in order by default; other branching heuristics from
+`ordering.py` can be chosen by name with the `variable` and `value` arguments.
+"""
+from collections import Counter
+from time import perf_counter
+
+from ordering import Tally, branching, uses_tally
+from strategies import STRATEGIES
+from topology import DIAGONAL
+
+
+class SolveStats(Counter):
+    """Search statistics and phase timings of one or more solves
+
+    A SolveStats can be passed as `counters` to `reduce_puzzle`, `search` and
+    `count_solutions`. Like a plain Counter it counts the candidates eliminated
+    by propagation ('eliminate', 'only_choice', 'naked_twins') and by each
+    strategy, and the digits tried while branching ('nodes'). It also records:
+
+    backtracks
+        the digits tried that led to a contradiction (or, when counting
+        solutions, to no solution)
+
+    max_depth
+        the deepest level of branching reached
+
+    times
+        a Counter of the seconds spent in propagation ('propagate'), in each
+        strategy, and in whole calls of `search` and `count_solutions` ('total')
+    """
+    SEARCH_KEYS = ('nodes', 'backtracks', 'max_depth')
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.times = Counter()
+
+    @property
+    def eliminations(self):
+        """A Counter of the candidates eliminated by each strategy"""
+        return Counter({name: n for name, n in self.items() if name not in self.SEARCH_KEYS})
+
+    def merge(self, other):
+        """Add the statistics of another solve to these ones"""
+        max_depth = max(self['max_depth'], other['max_depth'])
+        self.update(other)
+        self['max_depth'] = max_depth
+        self.times.update(getattr(other, 'times', ()))
+        return self
+
+    def as_dict(self):
+        """Return the statistics as plain dicts, e.g. to log them as JSON"""
+        return {'nodes': self['nodes'], 'backtracks': self['backtracks'],
+                'max_depth': self['max_depth'], 'eliminations': dict(self.eliminations),
+                'times': dict(self.times)}
+
+    def summary(self):
+        """Return the statistics as a single line of text"""
+        fields = ['{}={}'.format(key, self[key]) for key in self.SEARCH_KEYS]
+        fields += ['{}={}'.format(name, n) for name, n in sorted(self.eliminations.items())]
+        fields += ['{}_ms={:.3f}'.format(phase, t * 1000) for phase, t in sorted(self.times.items())]
+        return ' '.join(fields)
+
+
+def popcount(m):
+    """Return the number of candidates in a mask"""
+    return bin(m).count('1')
+
+
+def mask2digits(m, digits):
+    """Return the digits of a candidate mask as a string, e.g. '27' for 0b1000010"""
+    return ''.join(d for k, d in enumerate(digits) if m >> k & 1)
+
+
+def grid2board(grid, topology=DIAGONAL):
+    """Convert a grid string into a board with all candidates for empty boxes
+
+    Parameters
+    ----------
+    grid(string)
+        a string representing a sudoku grid.
+
+        Ex. '2.............62....1....7...6..8...3...9...7...6..4...4....8....52.............3'
+
+    topology(Topology)
+        the units, peers and digits of the variant to solve
+
+    Returns
+    -------
+    list
+        a list of N * N candidate masks in box order
+
+    Raises
+    ------
+    ValueError
+        if the grid has a character that is neither a digit of the topology nor '.'
+    """
+    digits = topology.digits
+    full = (1 << len(digits)) - 1
+    masks = {d: 1 << k for k, d in enumerate(digits)}
+    try:
+        return [full if c == '.' else masks[c] for c in grid]
+    except KeyError as e:
+        raise ValueError('unexpected character {!r} in grid {!r}, expected one of {!r}'.format(
+            e.args[0], grid, '.' + digits)) from None
+
+
+def board2grid(board, topology=DIAGONAL):
+    """Convert a board into a grid string with '.' for unsolved boxes
+
+    Parameters
+    ----------
+    board(list)
+        a list of N * N candidate masks in box order
+
+    topology(Topology)
+        the units, peers and digits of the variant to solve
+
+    Returns
+    -------
+    a string representing a sudoku grid.
+    """
+    digits = topology.digits
+    return ''.join(digits[m.bit_length() - 1] if m and not m & (m - 1) else '.' for m in board)
+
+
+def values2board(values, topology=DIAGONAL):
+    """Convert the dictionary representation into a board
+
+    Parameters
+    ----------
+    values(dict)
+        a dictionary of the form {'box_name': '123456789', ...}
+
+    topology(Topology)
+        the units and peers of the variant to solve
+
+    Returns
+    -------
+    list
+        a list of N * N candidate masks in box order
+    """
+    masks = {d: 1 << k for k, d in enumerate(topology.digits)}
+    board = []
+    for box in topology.boxes:
+        m = 0
+        for digit in values[box]:
+            m |= masks[digit]
+        board.append(m)
+    return board
+
+
+def board2values(board, topology=DIAGONAL):
+    """Convert a board into the dictionary representation
+
+    Parameters
+    ----------
+    board(list)
+        a list of N * N candidate masks in box order
+
+    topology(Topology)
+        the units and peers of the variant to solve
+
+    Returns
+    -------
+    dict
+        a dictionary of the form {'box_name': '123456789', ...}
+    """
+    digits = topology.digits
+    return {box: mask2digits(m, digits) for box, m in zip(topology.boxes, board)}
+
+
+def naked_twins(board, topology=DIAGONAL):
+    """Eliminate values using the naked twins strategy
+
+    See `solution.naked_twins`; all pairs of twins from the input board are
+    processed once.
+
+    Parameters
+    ----------
+    board(list)
+        a list of N * N candidate masks in box order
+
+    topology(Topology)
+        the units and peers of the variant to solve
+
+    Returns
+    -------
+    list
+        The board with the naked twins eliminated from peers
+    """
+    for unit in topology.unit_cells:
+        pairs = [board[i] for i in unit if popcount(board[i]) == 2]
+        for twin in set(pairs):
+            if pairs.count(twin) == 2:
+                for i in unit:
+                    m = board[i]
+                    if m & (m - 1) and m != twin:
+                        board[i] = m & ~twin
+    return board
+
+
+def eliminate(board, topology=DIAGONAL):
+    """Apply the eliminate strategy to a board
+
+    Parameters
+    ----------
+    board(list)
+        a list of N * N candidate masks in box order
+
+    topology(Topology)
+        the units and peers of the variant to solve
+
+    Returns
+    -------
+    list
+        The board with the assigned values eliminated from peers
+    """
+    peers = topology.cell_peers
+    solved = [(i, m) for i, m in enumerate(board) if m and not m & (m - 1)]
+    for i, m in solved:
+        keep = ~m
+        for p in peers[i]:
+            board[p] &= keep
+    return board
+
+
+def only_choice(board, topology=DIAGONAL):
+    """Apply the only choice strategy to a board
+
+    The digits that appear in exactly one box of a unit are found with two
+    running masks (seen at least once / seen at least twice) rather than by
+    scanning the unit once per digit.
+
+    Parameters
+    ----------
+    board(list)
+        a list of N * N candidate masks in box order
+
+    topology(Topology)
+        the units and peers of the variant to solve
+
+    Returns
+    -------
+    list
+        The board with all single-place digits assigned
+    """
+    for unit in topology.unit_cells:
+        once = twice = 0
+        for i in unit:
+            m = board[i]
+            twice |= once & m
+            once |= m
+        singles = once & ~twice
+        while singles:
+            bit = singles & -singles
+            singles ^= bit
+            for i in unit:
+                if board[i] & bit:
+                    board[i] = bit
+                    break
+    return board
+
+
+def propagate(board, dirty, trail=None, topology=DIAGONAL, counters=None):
+    """Apply eliminate, only choice and naked twins starting from changed boxes
+
+    Every box taken from the worklist removes its digit from its peers if it is
+    solved, and schedules the units it belongs to. Every scheduled unit is then
+    checked for digits with a single place left and for naked twins. Any box
+    changed along the way is put back on the worklist, so the board reaches the
+    same fixed point as sweeping all three strategies until nothing changes,
+    while only touching the boxes and units that can still make progress.
+
+    Parameters
+    ----------
+    board(list)
+        a list of N * N candidate masks in box order
+
+    dirty(iterable)
+        the indices of the boxes that changed since the board was last reduced
+
+    trail(list)
+        if given, an (index, previous mask) pair is appended for every change
+        so that it can be reverted with `undo`
+
+    topology(Topology)
+        the units and peers of the variant to solve
+
+    counters(Counter)
+        if given, the candidates eliminated by each rule are added under
+        'eliminate', 'only_choice' and 'naked_twins'
+
+    Returns
+    -------
+    list or False
+        The reduced board, or False if a box or a digit in a unit runs out of
+        possible places
+    """
+    unit_cells, cell_units, cell_peers = topology.unit_cells, topology.cell_units, topology.cell_peers
+    full = (1 << len(topology.digits)) - 1
+    stack = list(dirty)
+    queued = [False] * len(unit_cells)
+    queue = []
+    eliminated = only_choices = twins = 0
+    try:
+        while True:
+            while stack:
+                i = stack.pop()
+                m = board[i]
+                if not m:
+                    return False
+                if not m & (m - 1):
+                    for p in cell_peers[i]:
+                        pm = board[p]
+                        if pm & m:
+                            if pm == m:
+                                return False
+                            if trail is not None:
+                                trail.append((p, pm))
+                            board[p] = pm ^ m
+                            stack.append(p)
+                            eliminated += 1
+                for u in cell_units[i]:
+                    if not queued[u]:
+                        queued[u] = True
+                        queue.append(u)
+            if not queue:
+                return board
+
+            u = queue.pop()
+            queued[u] = False
+            unit = unit_cells[u]
+
+            # only choice
+            once = twice = 0
+            for i in unit:
+                m = board[i]
+                twice |= once & m
+                once |= m
+            if once != full:
+                return False
+            singles = once & ~twice
+            while singles:
+                bit = singles & -singles
+                singles ^= bit
+                for i in unit:
+                    m = board[i]
+                    if m & bit:
+                        if m != bit:
+                            if trail is not None:
+                                trail.append((i, m))
+                            board[i] = bit
+                            stack.append(i)
+                            only_choices += popcount(m) - 1
+                        break
+                else:
+                    return False
+
+            # naked twins
+            pairs = []
+            for i in unit:
+                m = board[i]
+                rest = m & (m - 1)
+                if rest and not rest & (rest - 1):
+                    pairs.append(m)
+            if len(pairs) < 2:
+                continue
+            for twin in set(pairs):
+                if pairs.count(twin) == 2:
+                    for i in unit:
+                        m = board[i]
+                        if m & twin and m & (m - 1) and m != twin:
+                            if trail is not None:
+                                trail.append((i, m))
+                            board[i] = m & ~twin
+                            stack.append(i)
+                            twins += popcount(m & twin)
+    finally:
+        if counters is not None:
+            counters['eliminate'] += eliminated
+            counters['only_choice'] += only_choices
+            counters['naked_twins'] += twins
+
+
+def undo(board, trail, mark=0):
+    """Revert the changes recorded on a trail back to a given length
+
+    Parameters
+    ----------
+    board(list)
+        a list of N * N candidate masks in box order
+
+    trail(list)
+        the (index, previous mask) pairs recorded by `propagate`
+
+    mark(int)
+        the length of the trail to return to
+    """
+    while len(trail) > mark:
+        i, m = trail.pop()
+        board[i] = m
+
+
+def _pipeline(strategies):
+    """Look up the strategy functions for a sequence of strategy names"""
+    try:
+        return tuple((name, STRATEGIES[name]) for name in strategies)
+    except KeyError as e:
+        raise ValueError('unknown strategy {}; choose from {}'.format(e, list(STRATEGIES)))
+
+
+def _reduce(board, dirty, trail, topology, pipeline, counters):
+    """Propagate from the dirty boxes, then run the strategy pipeline in order,
+    propagating again and restarting the pipeline whenever a strategy makes progress"""
+    if getattr(counters, 'times', None) is not None:
+        return _timed_reduce(board, dirty, trail, topology, pipeline, counters)
+    if propagate(board, dirty, trail, topology, counters) is False:
+        return False
+    while pipeline:
+        changed = []
+        for name, strategy in pipeline:
+            eliminated = strategy(board, topology, trail, changed)
+            if eliminated:
+                if counters is not None:
+                    counters[name] += eliminated
+                break
+        else:
+            break
+        if propagate(board, changed, trail, topology, counters) is False:
+            return False
+    return board
+
+
+def _timed_reduce(board, dirty, trail, topology, pipeline, stats):
+    """`_reduce` that adds the time spent in each phase to `stats.times`"""
+    times = stats.times
+    start = perf_counter()
+    reduced = propagate(board, dirty, trail, topology, stats)
+    times['propagate'] += perf_counter() - start
+    while reduced is not False and pipeline:
+        changed = []
+        for name, strategy in pipeline:
+            start = perf_counter()
+            eliminated = strategy(board, topology, trail, changed)
+            times[name] += perf_counter() - start
+            if eliminated:
+                stats[name] += eliminated
+                break
+        else:
+            break
+        start = perf_counter()
+        reduced = propagate(board, changed, trail, topology, stats)
+        times['propagate'] += perf_counter() - start
+    return False if reduced is False else board
+
+
+def _count_node(counters, depth):
+    counters['nodes'] += 1
+    if depth > counters['max_depth']:
+        counters['max_depth'] = depth
+
+
+def reduce_puzzle(board, topology=DIAGONAL, strategies=(), counters=None):
+    """Reduce a board by applying all constraint strategies until they stall
+
+    Parameters
+    ----------
+    board(list)
+        a list of N * N candidate masks in box order
+
+    topology(Topology)
+        the units and peers of the variant to solve
+
+    strategies(sequence)
+        names of the additional strategies in `strategies.STRATEGIES` to
+        apply, in order, whenever propagation stalls
+
+    counters(Counter or SolveStats)
+        if given, the candidates eliminated by each strategy are added to it
+        (and a SolveStats also records the time spent in each phase)
+
+    Returns
+    -------
+    list or False
+        The board after continued application of the constraint strategies
+        no longer produces any changes, or False if the puzzle is unsolvable
+    """
+    return _reduce(board, range(len(board)), None, topology, _pipeline(strategies), counters)
+
+
+def search(board, inplace=False, topology=DIAGONAL, strategies=(), counters=None,
+           variable='mrv', value='ascending'):
+    """Apply depth first search with constraint propagation to a board
+
+    Parameters
+    ----------
+    board(list)
+        a list of N * N candidate masks in box order
+
+    inplace(bool)
+        if True, search by mutating `board` and undoing changes from a trail
+        when backtracking instead of copying the board for every digit tried;
+        the board holds the solution on success and is restored on failure
+
+    topology(Topology)
+        the units and peers of the variant to solve
+
+    strategies(sequence)
+        names of the additional strategies to apply at every node (see
+        `reduce_puzzle`)
+
+    counters(Counter or SolveStats)
+        if given, the candidates eliminated by each strategy are added to it,
+        and the number of digits tried while branching to counters['nodes'];
+        a SolveStats also records the depth, backtracks and phase timings
+
+    variable(str)
+        how to choose the box to branch on, one of the keys of
+        `ordering.VARIABLE_ORDERINGS` (default: fewest candidates first)
+
+    value(str)
+        the order to try its candidates in, one of the keys of
+        `ordering.VALUE_ORDERINGS` (default: digit order)
+
+    Returns
+    -------
+    list or False
+        The board with all boxes assigned or False
+    """
+    pipeline = _pipeline(strategies)
+    heuristics = branching(variable, value)
+    if getattr(counters, 'times', None) is None:
+        return _search_root(board, inplace, topology, pipeline, heuristics, counters)
+    start = perf_counter()
+    try:
+        return _search_root(board, inplace, topology, pipeline, heuristics, counters)
+    finally:
+        counters.times['total'] += perf_counter() - start
+
+
+def _search_root(board, inplace, topology, pipeline, heuristics, counters):
+    """Reduce a board and search it, either by copying or in place"""
+    unsolved = range(len(board))
+    if inplace:
+        trail = []
+        if (_reduce(board, unsolved, trail, topology, pipeline, counters) is not False
+                and _search_inplace(board, trail, topology, pipeline, heuristics, counters,
+                                    unsolved, _root_tally(board, topology, heuristics))):
+            return board
+        undo(board, trail)
+        return False
+    board = _reduce(board, unsolved, None, topology, pipeline, counters)
+    if board is False:
+        return False
+    return _search(board, topology, pipeline, heuristics, counters, unsolved,
+                   _root_tally(board, topology, heuristics))
+
+
+def _root_tally(board, topology, heuristics):
+    """The `ordering.Tally` of a reduced board if the heuristics read one, else None"""
+    return Tally(board, topology) if uses_tally(heuristics) else None
+
+
+def _search(board, topology, pipeline, heuristics, counters, unsolved, tally, depth=1):
+    """Depth first search over a board that is already reduced
+
+    `unsolved` holds (at least) the unsolved boxes of the board in board order.
+    """
+    unsolved = [i for i in unsolved if board[i] & (board[i] - 1)]
+    if not unsolved:
+        return board
+    select, order = heuristics
+    s = select(board, unsolved, topology, tally)
+    for bit in order(board, s, topology, tally):
+        if counters is not None:
+            _count_node(counters, depth)
+        new_board = board[:]
+        new_board[s] = bit
+        # the changes are only recorded to advance the tally
+        changes = None if tally is None else [(s, board[s])]
+        if _reduce(new_board, (s,), changes, topology, pipeline, counters) is not False:
+            attempt = _search(new_board, topology, pipeline, heuristics, counters, unsolved,
+                              None if tally is None else tally.advance(new_board, changes, topology),
+                              depth + 1)
+            if attempt:
+                return attempt
+        if counters is not None:
+            counters['backtracks'] += 1
+    return False
+
+
+def _search_inplace(board, trail, topology, pipeline, heuristics, counters, unsolved, tally,
+                    depth=1):
+    """Depth first search over a reduced board, backtracking through the trail"""
+    unsolved = [i for i in unsolved if board[i] & (board[i] - 1)]
+    if not unsolved:
+        return board
+    select, order = heuristics
+    s = select(board, unsolved, topology, tally)
+    mark = len(trail)
+    for bit in order(board, s, topology, tally):
+        if counters is not None:
+            _count_node(counters, depth)
+        trail.append((s, board[s]))
+        board[s] = bit
+        if (_reduce(board, (s,), trail, topology, pipeline, counters) is not False
+                and _search_inplace(board, trail, topology, pipeline, heuristics, counters,
+                                    unsolved, _advance(tally, board, trail, mark, topology),
+                                    depth + 1)):
+            return board
+        if counters is not None:
+            counters['backtracks'] += 1
+        undo(board, trail, mark)
+    return False
+
+
+def solve(grid, topology=DIAGONAL, strategies=(), counters=None, variable='mrv',
+          value='ascending'):
+    """Find the solution to a Sudoku puzzle using the bitmask engine
+
+    Parameters
+    ----------
+    grid(string)
+        a string representing a sudoku grid.
+
+        Ex. '2.............62....1....7...6..8...3...9...7...6..4...4....8....52.............3'
+
+    topology(Topology)
+        the units and peers of the variant to solve
+
+    strategies(sequence)
+        names of the additional strategies to apply at every node (see
+        `reduce_puzzle`)
+
+    counters(Counter or SolveStats)
+        if given, the search statistics are added to it (see `search`)
+
+    variable(str), value(str)
+        the branching heuristics to search with (see `search`)
+
+    Returns
+    -------
+    dict or False
+        The dictionary representation of the final sudoku grid or False if no solution exists.
+    """
+    board = search(grid2board(grid, topology), inplace=True, topology=topology,
+                   strategies=strategies, counters=counters, variable=variable, value=value)
+    if board is False:
+        return False
+    return board2values(board, topology)
+
+
+def _advance(tally, board, trail, mark, topology):
+    """The tally of a board after the changes on the trail since `mark`, or None"""
+    if tally is None:
+        return None
+    return tally.advance(board, trail[mark:], topology)
+
+
+def _count_inplace(board, trail, topology, pipeline, heuristics, counters, limit, unsolved,
+                   tally, depth=1):
+    """Count the solutions of a reduced board, up to `limit` (None for all)"""
+    unsolved = [i for i in unsolved if board[i] & (board[i] - 1)]
+    if not unsolved:
+        return 1
+    select, order = heuristics
+    s = select(board, unsolved, topology, tally)
+    mark = len(trail)
+    count = 0
+    for bit in order(board, s, topology, tally):
+        if limit is not None and count >= limit:
+            break
+        if counters is not None:
+            _count_node(counters, depth)
+        trail.append((s, board[s]))
+        board[s] = bit
+        found = 0
+        if _reduce(board, (s,), trail, topology, pipeline, counters) is not False:
+            found = _count_inplace(board, trail, topology, pipeline, heuristics, counters,
+                                   None if limit is None else limit - count, unsolved,
+                                   _advance(tally, board, trail, mark, topology), depth + 1)
+            count += found
+        if counters is not None and not found:
+            counters['backtracks'] += 1
+        undo(board, trail, mark)
+    return count
+
+
+def count_solutions(grid, topology=DIAGONAL, limit=2, strategies=(), counters=None,
+                    variable='mrv', value='ascending'):
+    """Count the solutions of a Sudoku puzzle, stopping early at `limit`
+
+    The search backtracks through the trail like `search(inplace=True)`, so no
+    board is copied and no solution is materialized.
+
+    Parameters
+    ----------
+    grid(string)
+        a string representing a sudoku grid.
+
+    topology(Topology)
+        the units and peers of the variant to solve
+
+    limit(int)
+        stop counting once this many solutions are found; the default of 2 is
+        enough to tell unique puzzles apart; None counts every solution
+
+    strategies(sequence)
+        names of the additional strategies to apply at every node (see
+        `reduce_puzzle`)
+
+    counters(Counter or SolveStats)
+        if given, the candidates eliminated by each strategy are added to it,
+        and the number of digits tried while branching to counters['nodes'];
+        a SolveStats also records the depth, backtracks and phase timings
+
+    variable(str), value(str)
+        the branching heuristics to search with (see `search`)
+
+    Returns
+    -------
+    int
+        the number of solutions, at most `limit`
+    """
+    board = grid2board(grid, topology)
+    pipeline = _pipeline(strategies)
+    heuristics = branching(variable, value)
+    if limit is not None and limit < 1:
+        return 0
+    if getattr(counters, 'times', None) is None:
+        return _count_root(board, topology, pipeline, heuristics, counters, limit)
+    start = perf_counter()
+    try:
+        return _count_root(board, topology, pipeline, heuristics, counters, limit)
+    finally:
+        counters.times['total'] += perf_counter() - start
+
+
+def _count_root(board, topology, pipeline, heuristics, counters, limit):
+    trail = []
+    unsolved = range(len(board))
+    if _reduce(board, unsolved, trail, topology, pipeline, counters) is False:
+        return 0
+    return _count_inplace(board, trail, topology, pipeline, heuristics, counters, limit, unsolved,
+                          _root_tally(board, topology, heuristics))
+
+
+def is_unique(grid, topology=DIAGONAL, strategies=()):
+    """Return True if a Sudoku puzzle has exactly one solution"""
+    return count_solutions(grid, topology, 2, strategies) == 1
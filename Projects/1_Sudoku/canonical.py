@@ -0,0 +1,332 @@
+"""Canonical forms of Sudoku puzzles and a solution cache keyed by them
+
+Many puzzles are the same puzzle in disguise: permuting the bands, the rows
+within a band, the stacks and the columns within a stack, transposing the grid
+and relabeling the digits all map a puzzle to an equivalent one, whose
+solution is the same transformation of the original solution.
+`canonical_form` maps every puzzle to the smallest (as a string) of the
+puzzles it can be transformed into, and returns the transformation, so a
+solution of the canonical puzzle can be mapped back with `restore`.
+
+Enumerating all 3,359,232 geometric transformations of a 9x9 grid is far
+slower than solving the puzzle, so only the transformations that sort the rows,
+bands, columns and stacks by invariants (clue counts and digit frequencies,
+which every transformation preserves) are tried, enumerating all orders of the
+lines that tie. Equivalent puzzles get the same canonical form as long as
+there are at most `limit` such transformations; beyond that only the first
+`limit` are tried, which may give equivalent puzzles different forms (a
+cache miss) but never a wrong answer.
+
+Diagonal sudoku only keeps the rotations and reflections of the grid (plus
+relabeling), since the other permutations move the diagonals; other variants
+only merge puzzles that differ by a relabeling of the digits.
+
+`SolveCache` puts an LRU cache, optionally backed by a shelve file on disk, in
+front of the bitmask solver. Puzzles seen before are looked up as they are,
+before computing any canonical form.
+"""
+import hashlib
+import shelve
+from collections import OrderedDict
+from functools import lru_cache
+from itertools import islice, permutations, product
+
+import bitboard
+from topology import DIAGONAL, regular_topology
+
+
+@lru_cache(maxsize=None)
+def _symmetry(topology):
+    """Return ('regular' | 'diagonal' | None, box size) for a topology"""
+    n = len(topology.digits)
+    b = int(round(n ** 0.5))
+    if b * b == n and 2 <= b <= 5 and len(topology.boxes) == n * n:
+        if topology is regular_topology(b):
+            return 'regular', b
+        if topology is regular_topology(b, diagonal=True):
+            return 'diagonal', b
+    return None, 0
+
+
+def _relabel(grid, cells, digits):
+    """Return the grid read in `cells` order with the digits renamed in order of
+    first appearance, and the mapping from old to new digits"""
+    labels = {}
+    out = []
+    for k in cells:
+        c = grid[k]
+        if c != '.':
+            label = labels.get(c)
+            if label is None:
+                label = labels[c] = digits[len(labels)]
+            c = label
+        out.append(c)
+    return ''.join(out), labels
+
+
+def _tie_orders(items, key):
+    """Return every order of `items` sorted by `key` that differs only among ties"""
+    keys = {item: key(item) for item in items}
+    groups = OrderedDict()
+    for item in sorted(items, key=keys.__getitem__):
+        groups.setdefault(keys[item], []).append(item)
+    orders = [permutations(group) for group in groups.values()]
+    return [sum(parts, ()) for parts in product(*orders)]
+
+
+def _line_orders(n, b, line_key):
+    """Return every order of the n lines (rows or columns) in bands of b lines
+    that sorts the bands and the lines within each band by their invariants"""
+    bands = [tuple(range(k * b, (k + 1) * b)) for k in range(b)]
+    within = {band: _tie_orders(band, line_key) for band in bands}
+    band_orders = _tie_orders(bands, lambda band: tuple(sorted(line_key(i) for i in band)))
+    for band_order in band_orders:
+        for lines in product(*(within[band] for band in band_order)):
+            yield sum(lines, ())
+
+
+def _line_keys(lines, b, frequency):
+    """Return the invariants of each line given as a list of (position, digit)
+    pairs of its clues: the clue count, the clue counts per block of b
+    positions and the frequencies of its digits in the grid, the last two
+    sorted"""
+    keys = []
+    for clues in lines:
+        blocks = [0] * b
+        for i, _ in clues:
+            blocks[i // b] += 1
+        keys.append((len(clues), tuple(sorted(blocks)),
+                     tuple(sorted(frequency[c] for _, c in clues))))
+    return keys
+
+
+def _regular_candidates(grid, n, b, limit):
+    """Yield the cell orders of the transformations that sort the lines of a
+    regular grid by their invariants, for the grid and its transpose
+
+    The row orders are generated lazily and at most `limit` column orders are
+    kept, so taking `limit` candidates takes bounded work even on sparse
+    16x16 and 25x25 grids, whose lines nearly all tie."""
+    frequency = {}
+    row_clues = [[] for _ in range(n)]
+    col_clues = [[] for _ in range(n)]
+    for k, c in enumerate(grid):
+        if c != '.':
+            frequency[c] = frequency.get(c, 0) + 1
+            r, col = divmod(k, n)
+            row_clues[r].append((col, c))
+            col_clues[col].append((r, c))
+    row_keys = _line_keys(row_clues, b, frequency)
+    col_keys = _line_keys(col_clues, b, frequency)
+
+    for transpose in (False, True):
+        if transpose:
+            def cell(r, c):
+                return c * n + r
+            # the rows of the transpose are the columns of the grid and vice versa
+            row_key, col_key = col_keys.__getitem__, row_keys.__getitem__
+        else:
+            def cell(r, c):
+                return r * n + c
+            row_key, col_key = row_keys.__getitem__, col_keys.__getitem__
+
+        col_orders = list(islice(_line_orders(n, b, col_key), limit))
+        for rows in _line_orders(n, b, row_key):
+            for cols in col_orders:
+                yield [cell(r, c) for r in rows for c in cols]
+
+
+def _dihedral_candidates(n):
+    """Yield the cell orders of the rotations and reflections of an n x n grid"""
+    last = n - 1
+    maps = [lambda r, c: (r, c), lambda r, c: (c, last - r),
+            lambda r, c: (last - r, last - c), lambda r, c: (last - c, r),
+            lambda r, c: (r, last - c), lambda r, c: (last - r, c),
+            lambda r, c: (c, r), lambda r, c: (last - c, last - r)]
+    for f in maps:
+        yield [rc[0] * n + rc[1] for rc in (f(r, c) for r in range(n) for c in range(n))]
+
+
+def canonical_form(grid, topology=DIAGONAL, limit=512):
+    """Return the canonical form of a puzzle and the transformation to it
+
+    Parameters
+    ----------
+    grid(string)
+        a string representing a sudoku grid, with '.' for empty boxes
+
+    topology(Topology)
+        the units and peers of the variant of the puzzle
+
+    limit(int)
+        the largest number of transformations to try
+
+    Returns
+    -------
+    tuple
+        (canonical grid, cells, labels): box k of the canonical grid is box
+        cells[k] of `grid` with its digit renamed by the dict `labels`
+    """
+    n = len(topology.digits)
+    kind, b = _symmetry(topology)
+    if kind == 'regular':
+        candidates = _regular_candidates(grid, n, b, limit)
+    elif kind == 'diagonal':
+        candidates = _dihedral_candidates(n)
+    else:
+        candidates = [list(range(len(grid)))]
+    best = None
+    for cells in islice(candidates, limit):
+        form, labels = _relabel(grid, cells, topology.digits)
+        if best is None or form < best[0]:
+            best = (form, cells, labels)
+    return best
+
+
+def restore(grid, cells, labels):
+    """Map a grid in canonical form (e.g. the solution of a canonical puzzle)
+    back to the boxes and digits of the original puzzle
+
+    Parameters
+    ----------
+    grid(string)
+        a grid in canonical form
+
+    cells(list), labels(dict)
+        the transformation returned by `canonical_form`
+
+    Returns
+    -------
+    string
+        the grid in the original form
+    """
+    digits = {new: old for old, new in labels.items()}
+    # a digit missing from the puzzle was never relabeled; pair such digits up in order
+    alphabet = set(grid) - {'.'}
+    digits.update(zip(sorted(alphabet - set(digits)), sorted(alphabet - set(labels))))
+    out = [''] * len(grid)
+    for k, c in enumerate(grid):
+        out[cells[k]] = digits.get(c, c)
+    return ''.join(out)
+
+
+@lru_cache(maxsize=None)
+def _variant_key(topology):
+    """A key that identifies a topology across processes, for the disk cache"""
+    text = repr((topology.unitlist, topology.digits)).encode('ascii')
+    return hashlib.sha1(text).hexdigest()[:16]
+
+
+class SolveCache:
+    """Solutions of puzzles cached by canonical form
+
+    Parameters
+    ----------
+    maxsize(int)
+        the number of solutions to keep in memory, least recently used first out
+
+    path(str)
+        if given, solutions are also stored in a shelve database at this path,
+        which keeps them across processes and runs
+
+    strategies(sequence)
+        names of additional strategies to solve with (see `bitboard.reduce_puzzle`)
+
+    limit(int)
+        the largest number of transformations to try per puzzle (see
+        `canonical_form`)
+    """
+
+    def __init__(self, maxsize=4096, path=None, strategies=(), limit=512):
+        self.maxsize = maxsize
+        self.strategies = tuple(strategies)
+        self.limit = limit
+        self.hits = 0
+        self.misses = 0
+        self._lru = OrderedDict()
+        self._exact = OrderedDict()     # puzzle as given -> solution, in memory only
+        self._shelf = shelve.open(path) if path is not None else None
+
+    def _get(self, key):
+        try:
+            self._lru.move_to_end(key)
+            return self._lru[key]
+        except KeyError:
+            pass
+        if self._shelf is not None and key in self._shelf:
+            solved = self._shelf[key]
+            self._remember(key, solved)
+            return solved
+        return None
+
+    def _remember(self, key, solved, lru=None):
+        lru = self._lru if lru is None else lru
+        lru[key] = solved
+        if len(lru) > self.maxsize:
+            lru.popitem(last=False)
+
+    def solve_grid(self, grid, topology=DIAGONAL):
+        """Solve a puzzle, answering equivalent puzzles from the cache
+
+        Returns
+        -------
+        string or False
+            the solved grid, or False if the puzzle has no solution
+        """
+        if len(grid) != len(topology.boxes):
+            raise ValueError('expected a grid of {} boxes, got {}'.format(
+                len(topology.boxes), len(grid)))
+        variant = _variant_key(topology)
+        exact = variant + '=' + grid
+        solved = self._exact.get(exact)
+        if solved is not None:
+            self._exact.move_to_end(exact)
+            self.hits += 1
+            return solved
+        form, cells, labels = canonical_form(grid, topology, self.limit)
+        key = variant + ':' + form
+        solved = self._get(key)
+        if solved is None:
+            self.misses += 1
+            board = bitboard.search(bitboard.grid2board(form, topology), inplace=True,
+                                    topology=topology, strategies=self.strategies)
+            solved = bitboard.board2grid(board, topology) if board else False
+            self._remember(key, solved)
+            if self._shelf is not None:
+                self._shelf[key] = solved
+        else:
+            self.hits += 1
+        solved = restore(solved, cells, labels) if solved else False
+        self._remember(exact, solved, self._exact)
+        return solved
+
+    def solve(self, grid, topology=DIAGONAL):
+        """Solve a puzzle like `bitboard.solve`, answering equivalent puzzles from the cache
+
+        Returns
+        -------
+        dict or False
+            The dictionary representation of the final sudoku grid or False if no solution exists.
+        """
+        solved = self.solve_grid(grid, topology)
+        if not solved:
+            return False
+        return bitboard.board2values(bitboard.grid2board(solved, topology), topology)
+
+    def close(self):
+        if self._shelf is not None:
+            self._shelf.close()
+            self._shelf = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return len(self._lru)
+
+    def __repr__(self):
+        return '<SolveCache: {} solutions, {} hits, {} misses>'.format(
+            len(self._lru), self.hits, self.misses)
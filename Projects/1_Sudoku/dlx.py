@@ -0,0 +1,274 @@
+"""Exact cover (Algorithm X with Dancing Links) backend for Sudoku
+
+A Sudoku is an exact cover problem: every (box, digit) candidate is a row that
+covers four kinds of columns -- the box itself, and the digit in each unit the
+box belongs to (row, column, square and, for the diagonal variant, diagonals).
+A solution is a set of rows that covers every column exactly once.
+
+`DancingLinks` implements Knuth's Algorithm X over a sparse matrix stored as
+doubly linked lists in flat integer arrays, so covering and uncovering a column
+only relinks a few list cells. Enumerating solutions this way is much faster
+than copying boards in a depth first search when all solutions are needed,
+e.g. to count solutions or to check that a puzzle is unique.
+"""
+from itertools import islice
+
+import bitboard
+from topology import DIAGONAL
+
+
+class DancingLinks:
+    """A sparse 0/1 matrix for exact cover search
+
+    Node 0 is the root, nodes 1..n_columns are the column headers and every
+    1 in the matrix is one more node. For each node, L/R link the nodes of the
+    same row (headers: the active columns), U/D link the nodes of the same
+    column, C is the column header and S counts the active nodes per column.
+    """
+
+    def __init__(self, n_columns):
+        n = n_columns + 1
+        self.L = [i - 1 for i in range(n)]
+        self.R = [i + 1 for i in range(n)]
+        self.L[0] = n_columns
+        self.R[n_columns] = 0
+        self.U = list(range(n))
+        self.D = list(range(n))
+        self.C = list(range(n))
+        self.S = [0] * n
+        self.row_of = [None] * n
+
+    def add_row(self, row, columns):
+        """Add a row with a 1 in each of the given columns (numbered from 0)"""
+        L, R, U, D, C, S = self.L, self.R, self.U, self.D, self.C, self.S
+        first = None
+        for c in columns:
+            c += 1
+            node = len(C)
+            C.append(c)
+            self.row_of.append(row)
+            U.append(U[c])
+            D.append(c)
+            D[U[c]] = node
+            U[c] = node
+            S[c] += 1
+            if first is None:
+                first = node
+                L.append(node)
+                R.append(node)
+            else:
+                L.append(L[first])
+                R.append(first)
+                R[L[first]] = node
+                L[first] = node
+
+    def _cover(self, c):
+        L, R, U, D, C, S = self.L, self.R, self.U, self.D, self.C, self.S
+        R[L[c]] = R[c]
+        L[R[c]] = L[c]
+        i = D[c]
+        while i != c:
+            j = R[i]
+            while j != i:
+                D[U[j]] = D[j]
+                U[D[j]] = U[j]
+                S[C[j]] -= 1
+                j = R[j]
+            i = D[i]
+
+    def _uncover(self, c):
+        L, R, U, D, C, S = self.L, self.R, self.U, self.D, self.C, self.S
+        i = U[c]
+        while i != c:
+            j = L[i]
+            while j != i:
+                S[C[j]] += 1
+                D[U[j]] = j
+                U[D[j]] = j
+                j = L[j]
+            i = U[i]
+        R[L[c]] = c
+        L[R[c]] = c
+
+    def _select(self, r):
+        j = self.R[r]
+        while j != r:
+            self._cover(self.C[j])
+            j = self.R[j]
+
+    def _deselect(self, r):
+        j = self.L[r]
+        while j != r:
+            self._uncover(self.C[j])
+            j = self.L[j]
+
+    def solutions(self):
+        """Yield every exact cover as a list of row labels
+
+        The search is iterative (no recursion limit on large boards) and always
+        branches on the column with the fewest remaining rows.
+        """
+        R, D, C, S = self.R, self.D, self.C, self.S
+        chosen = []
+        while True:
+            if R[0] == 0:
+                yield [self.row_of[r] for r in chosen]
+                descend = False
+            else:
+                c = j = R[0]
+                size = S[c]
+                while j != 0 and size > 1:
+                    if S[j] < size:
+                        c, size = j, S[j]
+                    j = R[j]
+                descend = size > 0
+            if descend:
+                self._cover(c)
+                r = D[c]
+                chosen.append(r)
+                self._select(r)
+                continue
+            # backtrack to the deepest column with another row left to try
+            while chosen:
+                r = chosen.pop()
+                self._deselect(r)
+                c = C[r]
+                r = D[r]
+                if r != c:
+                    chosen.append(r)
+                    self._select(r)
+                    break
+                self._uncover(c)
+            else:
+                return
+
+
+def exact_cover(grid, topology=DIAGONAL):
+    """Build the exact cover matrix of a puzzle
+
+    Only the candidates left after removing the given digits from their peers
+    become rows, which keeps the matrix small.
+
+    Parameters
+    ----------
+    grid(string)
+        a string representing a sudoku grid.
+
+    topology(Topology)
+        the units, peers and digits of the variant to solve
+
+    Returns
+    -------
+    DancingLinks
+        a matrix whose rows are labelled with (box index, candidate mask) pairs
+    """
+    board = bitboard.eliminate(bitboard.grid2board(grid, topology), topology)
+    n_digits = len(topology.digits)
+    n_cells = len(board)
+    matrix = DancingLinks(n_cells + len(topology.unit_cells) * n_digits)
+    for i, m in enumerate(board):
+        units = topology.cell_units[i]
+        for d in range(n_digits):
+            if m >> d & 1:
+                matrix.add_row((i, 1 << d), [i] + [n_cells + u * n_digits + d for u in units])
+    return matrix
+
+
+def solutions(grid, topology=DIAGONAL):
+    """Yield every solution of a puzzle as a solved grid string
+
+    Parameters
+    ----------
+    grid(string)
+        a string representing a sudoku grid.
+
+    topology(Topology)
+        the units, peers and digits of the variant to solve
+
+    Returns
+    -------
+    generator
+        the solved grid strings
+    """
+    n_cells = len(topology.boxes)
+    for rows in exact_cover(grid, topology).solutions():
+        board = [0] * n_cells
+        for i, bit in rows:
+            board[i] = bit
+        yield bitboard.board2grid(board, topology)
+
+
+def count_solutions(grid, topology=DIAGONAL, limit=None):
+    """Count the solutions of a puzzle, stopping early at `limit`
+
+    Parameters
+    ----------
+    grid(string)
+        a string representing a sudoku grid.
+
+    topology(Topology)
+        the units, peers and digits of the variant to solve
+
+    limit(int)
+        stop counting once this many solutions are found (default: count all)
+
+    Returns
+    -------
+    int
+        the number of solutions, at most `limit`
+    """
+    return sum(1 for _ in islice(exact_cover(grid, topology).solutions(), limit))
+
+
+def solve(grid, topology=DIAGONAL):
+    """Find the first solution to a Sudoku puzzle using exact cover search
+
+    Parameters
+    ----------
+    grid(string)
+        a string representing a sudoku grid.
+
+        Ex. '2.............62....1....7...6..8...3...9...7...6..4...4....8....52.............3'
+
+    topology(Topology)
+        the units, peers and digits of the variant to solve
+
+    Returns
+    -------
+    dict or False
+        The dictionary representation of the final sudoku grid or False if no solution exists.
+    """
+    for solved in solutions(grid, topology):
+        return bitboard.board2values(bitboard.grid2board(solved, topology), topology)
+    return False
+
+
+if __name__ == "__main__":
+    import argparse
+    from timeit import default_timer as timer
+
+    import solution
+    from topology import REGULAR
+
+    parser = argparse.ArgumentParser(description="Compare the exact cover search with the " +
+        "constraint propagation searches on a few puzzles.")
+    parser.add_argument('grids', nargs='*', help="Puzzles to solve (default: a few hard ones).")
+    parser.add_argument('--diagonal', action='store_true', help="Solve diagonal sudoku puzzles.")
+    args = parser.parse_args()
+
+    topology = DIAGONAL if args.diagonal else REGULAR
+    grids = args.grids or [
+        '8..........36......7..9.2...5...7.......457.....1...3...1....68..85...1..9....4..',
+        '4.....8.5.3..........7......2.....6.....8.4......1.......6.3.7.5..2.....1.4......',
+        '..............3.85..1.2.......5.7.....4...1...9.......5......73..2.1........4...9']
+    print("{:<10}{:>12}{:>12}{:>12}{:>12}".format("puzzle", "search", "bitboard", "dlx", "dlx count"))
+    for n, grid in enumerate(grids, 1):
+        times = []
+        for method in ('search', 'bitboard', 'dlx'):
+            start = timer()
+            solution.solve(grid, topology, method)
+            times.append(timer() - start)
+        start = timer()
+        count_solutions(grid, topology)
+        times.append(timer() - start)
+        print("{:<10}".format(n) + "".join("{:>11.4f}s".format(t) for t in times))
@@ -0,0 +1,262 @@
+"""Generate Sudoku puzzles with a unique solution
+
+A puzzle is made by filling a board at random and removing clues one at a time
+in random order, keeping a removal only if the puzzle still has exactly one
+solution. As the puzzle had a unique solution before the removal, it still
+has one exactly if no solution puts a different digit in the emptied box, so
+each check is a single search with that digit excluded, which stops at the
+first solution found, i.e. as soon as there would be a second solution.
+
+Removal stops at the target number of clues. Random removal rarely gets far
+below the number of clues of a typical minimal puzzle (22-26 on a 9x9 board),
+so each puzzle gets a few attempts from fresh solutions to reach the target.
+The difficulty can be constrained as well: 'easy' puzzles are solved by
+constraint propagation alone, 'hard' puzzles need search.
+
+    python generator.py -n 1000 --clues 24 --difficulty hard --variant regular -w 4
+
+`generate_many` generates on a process pool; every puzzle is generated from its
+own seed, so a batch is reproducible regardless of the number of workers.
+"""
+import argparse
+import os
+import random
+import sys
+from multiprocessing import Pool
+
+import bitboard
+from batch import BatchStats
+from topology import DIAGONAL, VARIANTS
+
+DIFFICULTIES = ('easy', 'hard')
+
+
+def random_solution(topology=DIAGONAL, rng=random):
+    """Return a random solved board
+
+    Parameters
+    ----------
+    topology(Topology)
+        the units and peers of the variant to fill
+
+    rng(random.Random)
+        the source of randomness
+
+    Returns
+    -------
+    list
+        a board with every box assigned
+    """
+    board = bitboard.grid2board('.' * len(topology.boxes), topology)
+    if not _fill(board, [], topology, rng):
+        raise ValueError('{!r} has no solution'.format(topology))
+    return board
+
+
+def _fill(board, trail, topology, rng):
+    """Depth first search with random tie breaks and digit order"""
+    unsolved = [i for i, m in enumerate(board) if m & (m - 1)]
+    if not unsolved:
+        return True
+    fewest = min(bitboard.popcount(board[i]) for i in unsolved)
+    s = rng.choice([i for i in unsolved if bitboard.popcount(board[i]) == fewest])
+    bits = [1 << d for d in range(len(topology.digits)) if board[s] >> d & 1]
+    rng.shuffle(bits)
+    mark = len(trail)
+    for bit in bits:
+        trail.append((s, board[s]))
+        board[s] = bit
+        if bitboard.propagate(board, (s,), trail, topology) is not False and _fill(
+                board, trail, topology, rng):
+            return True
+        bitboard.undo(board, trail, mark)
+    return False
+
+
+def is_easy(grid, topology=DIAGONAL):
+    """Return True if constraint propagation alone solves a puzzle"""
+    board = bitboard.reduce_puzzle(bitboard.grid2board(grid, topology), topology)
+    return board is not False and not any(m & (m - 1) for m in board)
+
+
+def remove_clues(grid, topology=DIAGONAL, clues=0, difficulty=None, rng=random):
+    """Remove clues from a puzzle in random order while it stays unique
+
+    Parameters
+    ----------
+    grid(string)
+        a puzzle with a unique solution (e.g. a solved grid)
+
+    topology(Topology)
+        the units and peers of the variant
+
+    clues(int)
+        stop as soon as the puzzle has this many clues
+
+    difficulty(str)
+        with 'easy', a removal is also undone if the puzzle would need search
+
+    rng(random.Random)
+        the source of randomness
+
+    Returns
+    -------
+    string
+        the puzzle with fewer clues
+    """
+    cells = [i for i, c in enumerate(grid) if c != '.']
+    rng.shuffle(cells)
+    puzzle = list(grid)
+    remaining = len(cells)
+    for i in cells:
+        if remaining <= clues:
+            break
+        digit, puzzle[i] = puzzle[i], '.'
+        candidate = ''.join(puzzle)
+        if not _still_unique(candidate, i, digit, topology) or (
+                difficulty == 'easy' and not is_easy(candidate, topology)):
+            puzzle[i] = digit
+        else:
+            remaining -= 1
+    return ''.join(puzzle)
+
+
+def _still_unique(grid, i, digit, topology):
+    """Return True if the puzzle that `grid` came from by removing `digit` at
+    box `i` is still unique, i.e. if no solution puts another digit there"""
+    board = bitboard.grid2board(grid, topology)
+    board[i] &= ~(1 << topology.digits.index(digit))
+    return bitboard.search(board, inplace=True, topology=topology) is False
+
+
+def generate(topology=DIAGONAL, clues=None, difficulty=None, seed=None, attempts=10):
+    """Generate a puzzle with a unique solution
+
+    Parameters
+    ----------
+    topology(Topology)
+        the units and peers of the variant to generate
+
+    clues(int)
+        the number of clues to reach (default: remove clues until no more
+        can be removed, which gives a minimal puzzle)
+
+    difficulty(str)
+        None for any puzzle, 'easy' for puzzles solved without search, or
+        'hard' for puzzles that need search
+
+    seed(int)
+        seed of the random number generator, to reproduce a puzzle
+
+    attempts(int)
+        the number of random solutions to start from before giving up
+
+    Returns
+    -------
+    string or None
+        the puzzle, or None if no attempt reached the target
+    """
+    if difficulty is not None and difficulty not in DIFFICULTIES:
+        raise ValueError('difficulty must be one of {}, got {!r}'.format(DIFFICULTIES, difficulty))
+    rng = random.Random(seed)
+    target = clues or 0
+    for _ in range(attempts):
+        solution = bitboard.board2grid(random_solution(topology, rng), topology)
+        puzzle = remove_clues(solution, topology, target, difficulty, rng)
+        if clues is not None and sum(c != '.' for c in puzzle) > clues:
+            continue
+        if difficulty == 'hard' and is_easy(puzzle, topology):
+            continue
+        return puzzle
+    return None
+
+
+def _generate_one(args):
+    return generate(*args)
+
+
+def generate_many(count, topology=DIAGONAL, clues=None, difficulty=None, seed=0, workers=None,
+                  attempts=10, chunksize=4, stats=None):
+    """Generate many puzzles on a process pool, yielding them in seed order
+
+    Parameters
+    ----------
+    count(int)
+        the number of puzzles to generate
+
+    topology(Topology), clues(int), difficulty(str), attempts(int)
+        see `generate`
+
+    seed(int)
+        puzzle k is generated with seed `seed + k`
+
+    workers(int)
+        the number of worker processes (default: os.cpu_count()); with 1 the
+        puzzles are generated in the calling process
+
+    chunksize(int)
+        the number of puzzles sent to a worker at a time
+
+    stats(BatchStats)
+        if given, updated with throughput statistics as puzzles are yielded
+
+    Returns
+    -------
+    generator
+        the puzzles, or None for each seed that did not reach the target
+    """
+    workers = workers or os.cpu_count() or 1
+    tasks = ((topology, clues, difficulty, seed + k, attempts) for k in range(count))
+    if workers == 1:
+        results = map(_generate_one, tasks)
+    else:
+        results = _generate_pooled(tasks, workers, chunksize)
+    for puzzle in results:
+        if stats is not None:
+            stats.update(puzzle)
+        yield puzzle
+
+
+def _generate_pooled(tasks, workers, chunksize):
+    with Pool(workers) as pool:
+        yield from pool.imap(_generate_one, tasks, chunksize)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate Sudoku puzzles with a unique " +
+        "solution, one per line.")
+    parser.add_argument('-n', '--count', type=int, default=10,
+                        help="Number of puzzles to generate (default: 10).")
+    parser.add_argument('-c', '--clues', type=int, default=None,
+                        help="Number of clues to reach (default: as few as possible).")
+    parser.add_argument('-d', '--difficulty', choices=DIFFICULTIES, default=None,
+                        help="Only generate puzzles that are solved without search (easy) " +
+                        "or that need search (hard).")
+    parser.add_argument('-v', '--variant', choices=sorted(VARIANTS), default='diagonal',
+                        help="Sudoku variant of the puzzles (default: diagonal).")
+    parser.add_argument('--seed', type=int, default=0,
+                        help="Seed of the first puzzle; puzzle k uses seed + k (default: 0).")
+    parser.add_argument('-a', '--attempts', type=int, default=10,
+                        help="Solutions to start from per puzzle before giving up (default: 10).")
+    parser.add_argument('-w', '--workers', type=int, default=None,
+                        help="Number of worker processes (default: number of CPUs).")
+    parser.add_argument('-o', '--output', default='-',
+                        help="Path of the output file (default: stdout).")
+    parser.add_argument('-q', '--quiet', action='store_true',
+                        help="Do not print throughput statistics to stderr.")
+    args = parser.parse_args()
+
+    out = sys.stdout if args.output == '-' else open(args.output, 'w')
+    stats = BatchStats()
+    try:
+        for puzzle in generate_many(args.count, VARIANTS[args.variant], args.clues,
+                                    args.difficulty, args.seed, args.workers, args.attempts,
+                                    stats=stats):
+            if puzzle is not None:
+                out.write(puzzle + '\n')
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    if not args.quiet:
+        print('{} puzzles in {:.3f}s, {:.1f} puzzles/s; {} missed the target'.format(
+            stats.puzzles, stats.elapsed, stats.rate, stats.failed), file=sys.stderr)
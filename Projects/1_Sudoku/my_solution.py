@@ -239,7 +239,7 @@ if __name__ == "__main__":
 
     try:
         import PySudoku
-        PySudoku.play(grid2values(diag_sudoku_grid), result, history)
+        PySudoku.play(grid2values(diag_sudoku_grid), result, History())
 
     except SystemExit:
         pass
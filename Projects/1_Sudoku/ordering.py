@@ -0,0 +1,185 @@
+"""Branching heuristics for the bitmask search
+
+When propagation stalls, `bitboard.search` picks an unsolved box (variable
+ordering) and tries its candidates one at a time (value ordering). Both can be
+chosen by name from the tables at the end of this module.
+
+A variable ordering has the signature ``select(board, unsolved, topology,
+tally=None)`` and returns one of the indices in `unsolved`, the unsolved boxes
+in board order. The search keeps that list incrementally: every node filters
+the list of its parent instead of scanning the whole board, and backtracking
+simply returns to the parent's list.
+
+A value ordering has the signature ``order(board, i, topology, tally=None)``
+and returns the candidate bits of box `i` in the order to try them. Use
+`branching` to look up both by name.
+
+The orderings that count over the board (`mrv_degree` and `frequency`) read
+their counts from a `Tally`. The search builds one at the root only when
+`uses_tally` says the orderings need it, and derives the tally of every node
+from its parent's and the changes recorded on the trail, so backtracking
+returns to the parent's tally. Called without a tally, they count from
+scratch.
+"""
+from collections import OrderedDict
+
+
+def _popcount(m):
+    return bin(m).count('1')
+
+
+def _bits(m):
+    bits = []
+    while m:
+        bit = m & -m
+        bits.append(bit)
+        m ^= bit
+    return bits
+
+
+class Tally:
+    """Counts over a board for the branching heuristics
+
+    Attributes
+    ----------
+    places(list)
+        for each digit bit k, the number of boxes that have it as a candidate
+
+    unsolved_peers(list)
+        for each box, the number of its peers that are not solved
+    """
+    __slots__ = ('places', 'unsolved_peers')
+
+    def __init__(self, board, topology, places=None, unsolved_peers=None):
+        if places is None:
+            places = [0] * len(topology.digits)
+            for m in board:
+                while m:
+                    bit = m & -m
+                    places[bit.bit_length() - 1] += 1
+                    m ^= bit
+            unsolved_peers = [sum(1 for p in peers if board[p] & (board[p] - 1))
+                              for peers in topology.cell_peers]
+        self.places = places
+        self.unsolved_peers = unsolved_peers
+
+    def advance(self, board, changes, topology):
+        """Return the tally of `board` after `changes`, the (index, previous
+        mask) pairs recorded since this tally was taken, leaving this one as it
+        is for backtracking"""
+        places, unsolved_peers = self.places[:], self.unsolved_peers[:]
+        cell_peers = topology.cell_peers
+        first = {}
+        for i, before in changes:
+            # candidates are only ever removed, so the first entry of a box
+            # holds its mask when this tally was taken
+            if i not in first:
+                first[i] = before
+        for i, before in first.items():
+            m = board[i]
+            removed = before & ~m
+            while removed:
+                bit = removed & -removed
+                places[bit.bit_length() - 1] -= 1
+                removed ^= bit
+            if before & (before - 1) and not m & (m - 1):
+                for p in cell_peers[i]:
+                    unsolved_peers[p] -= 1
+        return Tally(board, topology, places, unsolved_peers)
+
+
+def mrv(board, unsolved, topology, tally=None):
+    """Minimum remaining values: the box with the fewest candidates
+
+    Ties go to the first box in board order.
+    """
+    best, fewest = None, len(topology.digits) + 1
+    for i in unsolved:
+        n = _popcount(board[i])
+        if n < fewest:
+            best, fewest = i, n
+            if n == 2:
+                break
+    return best
+
+
+def mrv_degree(board, unsolved, topology, tally=None):
+    """Minimum remaining values, breaking ties by degree
+
+    Among the boxes with the fewest candidates, choose the one with the most
+    unsolved peers (read from the tally), whose assignment constrains the rest
+    of the board most.
+    """
+    if tally is None:
+        tally = Tally(board, topology)
+    unsolved_peers = tally.unsolved_peers
+    counts = [(_popcount(board[i]), i) for i in unsolved]
+    fewest = min(counts)[0]
+    best, degree = None, -1
+    for n, i in counts:
+        if n != fewest:
+            continue
+        d = unsolved_peers[i]
+        if d > degree:
+            best, degree = i, d
+    return best
+
+
+def ascending(board, i, topology, tally=None):
+    """Try the candidates in digit order"""
+    return _bits(board[i])
+
+
+def least_constraining(board, i, topology, tally=None):
+    """Least constraining value: try first the candidates that the fewest
+    unsolved peers could also take, so they eliminate the fewest candidates"""
+    peers = [board[p] for p in topology.cell_peers[i]]
+    peers = [m for m in peers if m & (m - 1)]
+    return sorted(_bits(board[i]), key=lambda bit: sum(1 for m in peers if m & bit))
+
+
+def frequency(board, i, topology, tally=None):
+    """Try first the candidates with the fewest places left on the whole board
+    (read from the tally), i.e. the digits that are already placed most often"""
+    if tally is None:
+        tally = Tally(board, topology)
+    places = tally.places
+    return sorted(_bits(board[i]), key=lambda bit: places[bit.bit_length() - 1])
+
+
+VARIABLE_ORDERINGS = OrderedDict([
+    ('mrv', mrv),
+    ('mrv_degree', mrv_degree),
+])
+
+VALUE_ORDERINGS = OrderedDict([
+    ('ascending', ascending),
+    ('lcv', least_constraining),
+    ('frequency', frequency),
+])
+
+
+# the orderings that read a Tally
+_TALLIED = frozenset([mrv_degree, frequency])
+
+
+def uses_tally(heuristics):
+    """Return True if any of the (select, order) functions reads a `Tally`"""
+    return any(f in _TALLIED for f in heuristics)
+
+
+def branching(variable, value):
+    """Look up a variable and a value ordering by name
+
+    Returns
+    -------
+    tuple
+        the (select, order) functions
+    """
+    if variable not in VARIABLE_ORDERINGS:
+        raise ValueError('unknown variable ordering {!r}; choose from {}'.format(
+            variable, list(VARIABLE_ORDERINGS)))
+    if value not in VALUE_ORDERINGS:
+        raise ValueError('unknown value ordering {!r}; choose from {}'.format(
+            value, list(VALUE_ORDERINGS)))
+    return VARIABLE_ORDERINGS[variable], VALUE_ORDERINGS[value]
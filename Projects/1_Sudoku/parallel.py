@@ -0,0 +1,152 @@
+"""Solve a single hard puzzle on all cores
+
+`parallel_search` expands the top levels of the search tree breadth first until
+there are a few independent subproblems per worker, then searches them on a
+process pool. The subproblems are handed out one at a time in the order the
+sequential search would visit them, and the pool is terminated as soon as one
+of them is solved, which cancels every subproblem that is still running or
+queued.
+
+Starting a pool costs tens of milliseconds, so this only pays off for puzzles
+that take much longer than that to solve sequentially (large boards, or
+puzzles crafted against the branching heuristics); use `bitboard.search`
+otherwise. If a puzzle has several solutions, the one returned is whichever is
+found first and can differ between runs.
+"""
+import os
+from multiprocessing import Pool
+
+import bitboard
+from ordering import branching
+from topology import DIAGONAL
+
+
+def split(board, topology=DIAGONAL, count=8, strategies=(), variable='mrv', value='ascending'):
+    """Expand the top of the search tree into at least `count` subproblems
+
+    Parameters
+    ----------
+    board(list)
+        a list of N * N candidate masks in box order, already reduced
+
+    topology(Topology)
+        the units and peers of the variant to solve
+
+    count(int)
+        the number of subproblems to stop at; fewer are returned if the
+        search tree runs out first
+
+    strategies(sequence), variable(str), value(str)
+        the strategies and branching heuristics of the search (see
+        `bitboard.search`)
+
+    Returns
+    -------
+    list
+        the reduced boards of the subproblems, in the order the sequential
+        search would visit them; a solved board is returned on its own
+    """
+    select, order = branching(variable, value)
+    frontier = [board]
+    while len(frontier) < count:
+        expanded = []
+        for b in frontier:
+            unsolved = [i for i, m in enumerate(b) if m & (m - 1)]
+            if not unsolved:
+                return [b]
+            s = select(b, unsolved, topology)
+            for bit in order(b, s, topology):
+                child = b[:]
+                child[s] = bit
+                if bitboard.reduce_puzzle(child, topology, strategies) is not False:
+                    expanded.append(child)
+        frontier = expanded
+        if not frontier:
+            break
+    return frontier
+
+
+def _search_subproblem(args):
+    board, topology, strategies, variable, value = args
+    return bitboard.search(board, inplace=True, topology=topology, strategies=strategies,
+                           variable=variable, value=value)
+
+
+def parallel_search(board, topology=DIAGONAL, workers=None, strategies=(), variable='mrv',
+                    value='ascending', split_factor=4):
+    """Search a board on a process pool, stopping at the first solution
+
+    Parameters
+    ----------
+    board(list)
+        a list of N * N candidate masks in box order
+
+    topology(Topology)
+        the units and peers of the variant to solve
+
+    workers(int)
+        the number of worker processes (default: os.cpu_count())
+
+    strategies(sequence), variable(str), value(str)
+        the strategies and branching heuristics of the search (see
+        `bitboard.search`)
+
+    split_factor(int)
+        the number of subproblems to create per worker, so that workers that
+        finish an easy subproblem early have more work to take
+
+    Returns
+    -------
+    list or False
+        The board with all boxes assigned or False
+    """
+    workers = workers or os.cpu_count() or 1
+    board = bitboard.reduce_puzzle(board, topology, strategies)
+    if board is False:
+        return False
+    subproblems = split(board, topology, workers * split_factor, strategies, variable, value)
+    if len(subproblems) <= 1 or workers == 1:
+        for subproblem in subproblems:
+            solved = _search_subproblem((subproblem, topology, strategies, variable, value))
+            if solved:
+                return solved
+        return False
+    tasks = [(subproblem, topology, strategies, variable, value) for subproblem in subproblems]
+    # leaving the with block terminates the pool, which cancels the other subproblems
+    with Pool(min(workers, len(tasks))) as pool:
+        for solved in pool.imap_unordered(_search_subproblem, tasks):
+            if solved:
+                return solved
+    return False
+
+
+def solve(grid, topology=DIAGONAL, workers=None, strategies=(), variable='mrv', value='ascending'):
+    """Find the solution to a Sudoku puzzle using every core
+
+    Parameters
+    ----------
+    grid(string)
+        a string representing a sudoku grid.
+
+        Ex. '2.............62....1....7...6..8...3...9...7...6..4...4....8....52.............3'
+
+    topology(Topology)
+        the units and peers of the variant to solve
+
+    workers(int)
+        the number of worker processes (default: os.cpu_count())
+
+    strategies(sequence), variable(str), value(str)
+        the strategies and branching heuristics of the search (see
+        `bitboard.search`)
+
+    Returns
+    -------
+    dict or False
+        The dictionary representation of the final sudoku grid or False if no solution exists.
+    """
+    board = parallel_search(bitboard.grid2board(grid, topology), topology, workers, strategies,
+                            variable, value)
+    if board is False:
+        return False
+    return bitboard.board2values(board, topology)
@@ -0,0 +1,217 @@
+"""Headless replay of a solve for the visualization
+
+`PySudoku.play` needs a display, and rebuilds every square and redraws the
+whole board for every frame. `Replay` draws the board once into an offscreen
+surface and then only redraws the squares whose value changes, blitting each
+square from a tile rendered once per value, so a solve can be exported as a
+sequence of images or as a GIF (with Pillow installed) without a display
+server:
+
+    python replay.py puzzles/diagonal.txt -o replays --format gif --steps 4
+
+The SDL dummy video driver is used unless SDL_VIDEODRIVER is already set.
+"""
+import argparse
+import os
+import sys
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+import pygame
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.join(HERE, 'objects'))
+from SudokuSquare import AAfilledRoundedRect
+
+import solution
+from topology import DIAGONAL, VARIANTS
+from utils import History, boxes, cols, grid2values, reconstruct, rows
+
+BACKGROUND = os.path.join(HERE, 'images', 'sudoku-board-bare.jpg')
+SQUARE = (45, 40)
+SOLVED_COLOR = (2, 204, 186)
+EMPTY_COLOR = (255, 255, 255)
+TEXT_COLOR = (255, 255, 255)
+
+
+def square_origin(x, y):
+    """Return the top left corner of the square in column x and row y of the
+    board image, with the same layout as `PySudoku.play`"""
+    return x * 57 + (38, 99, 159)[x // 3], y * 57 + (35, 100, 165)[y // 3]
+
+
+class Replay:
+    """An offscreen rendering of a board that redraws only the squares that change
+
+    Parameters
+    ----------
+    values(dict)
+        the starting board, a dictionary of the form {'box_name': '123456789', ...}
+
+    background(str)
+        path of the board image to draw the squares on
+    """
+
+    def __init__(self, values, background=BACKGROUND):
+        pygame.font.init()
+        self.background = pygame.image.load(background)
+        self.surface = self.background.copy()
+        self.font = pygame.font.SysFont('opensans', 21)
+        self.values = {}
+        self._tiles = {}
+        self._rects = {}
+        for y, r in enumerate(rows):
+            for x, c in enumerate(cols):
+                self._rects[r + c] = pygame.Rect(square_origin(x, y), SQUARE)
+        for box in boxes:
+            self.values[box] = values[box]
+            self._draw(box)
+
+    def _tile(self, digit):
+        """The square for a digit ('' for an unsolved box), rendered once"""
+        tile = self._tiles.get(digit)
+        if tile is None:
+            tile = pygame.Surface(SQUARE, pygame.SRCALPHA)
+            AAfilledRoundedRect(tile, ((0, 0), SQUARE), SOLVED_COLOR if digit else EMPTY_COLOR)
+            tile.blit(self.font.render(digit, 1, TEXT_COLOR), (17, 4))
+            self._tiles[digit] = tile
+        return tile
+
+    def _draw(self, box):
+        rect = self._rects[box]
+        value = self.values[box]
+        # the corners of the tile are transparent, so restore the board under it first
+        self.surface.blit(self.background, rect, rect)
+        self.surface.blit(self._tile(value if len(value) == 1 else ''), rect)
+        return rect
+
+    def apply(self, box, value):
+        """Assign a value to a box, returning the rect redrawn or None if nothing changed"""
+        if self.values[box] == value:
+            return None
+        self.values[box] = value
+        return self._draw(box)
+
+    def frames(self, assignments, steps=1):
+        """Apply assignments in order, yielding the surface every `steps` assignments
+
+        The first frame is the starting board and the last one is the board
+        after every assignment. The same surface is yielded every time, so
+        save or copy it before asking for the next frame.
+
+        Returns
+        -------
+        generator
+            (surface, dirty) pairs, where dirty lists the rects redrawn since
+            the previous frame
+        """
+        yield self.surface, [self.surface.get_rect()]
+        dirty = []
+        pending = 0
+        for box, value in assignments:
+            rect = self.apply(box, value)
+            if rect is not None:
+                dirty.append(rect)
+            pending += 1
+            if pending == steps:
+                yield self.surface, dirty
+                dirty = []
+                pending = 0
+        if pending:
+            yield self.surface, dirty
+
+
+def solve_replay(grid, topology=DIAGONAL):
+    """Solve a puzzle with the search in solution.py and return its replay
+
+    Returns
+    -------
+    tuple or None
+        (starting values, assignments), or None if the puzzle has no solution
+    """
+    history = History()
+    values = solution.solve(grid, topology, history=history)
+    if values is False:
+        return None
+    return grid2values(grid), reconstruct(values, history)
+
+
+def save_frames(frames, directory, prefix='frame', ext='png'):
+    """Save frames as numbered images in a directory, returning their paths
+
+    The format follows `ext`: 'png' is compressed, while 'bmp' and 'tga' are
+    written tens of times faster at a few times the size.
+    """
+    os.makedirs(directory, exist_ok=True)
+    paths = []
+    for k, (surface, dirty) in enumerate(frames):
+        path = os.path.join(directory, '{}_{:04d}.{}'.format(prefix, k, ext))
+        pygame.image.save(surface, path)
+        paths.append(path)
+    return paths
+
+
+def _to_image(surface, rect):
+    from PIL import Image
+    pixels = pygame.image.tostring(surface.subsurface(rect), 'RGB')
+    return Image.frombytes('RGB', rect.size, pixels)
+
+
+def save_gif(frames, path, duration=200):
+    """Save frames as an animated GIF, showing each for `duration` milliseconds
+
+    Pygame cannot write GIFs, so this needs Pillow. The first frame is
+    quantized to a palette once; after that only the dirty rects are
+    quantized (to the same palette) and pasted into a copy of the previous
+    frame, so unchanged pixels keep their palette index and the GIF encoder
+    only stores the regions that changed.
+    """
+    images = []
+    for surface, dirty in frames:
+        if not images:
+            image = _to_image(surface, surface.get_rect()).quantize(256)
+        else:
+            image = images[-1].copy()
+            for rect in dirty:
+                image.paste(_to_image(surface, rect).quantize(palette=image), rect.topleft)
+        images.append(image)
+    images[0].save(path, save_all=True, append_images=images[1:], duration=duration, loop=0,
+                   optimize=False)
+    return path
+
+
+def _read_puzzles(path):
+    with open(path) as f:
+        return [line.strip() for line in f if line.strip() and not line.startswith('#')]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Render solve replays of Sudoku puzzles " +
+        "without a display.")
+    parser.add_argument('input', help="Path of a file with one puzzle per line.")
+    parser.add_argument('-o', '--output', default='replays',
+                        help="Directory to write the replays to (default: replays).")
+    parser.add_argument('-v', '--variant', choices=sorted(VARIANTS), default='diagonal',
+                        help="Sudoku variant of the puzzles (default: diagonal).")
+    parser.add_argument('-s', '--steps', type=int, default=1,
+                        help="Assignments per frame (default: 1).")
+    parser.add_argument('-n', '--limit', type=int, default=None,
+                        help="Only replay the first N puzzles.")
+    parser.add_argument('-f', '--format', choices=('png', 'bmp', 'tga', 'gif'), default='png',
+                        help="Write one directory of images per puzzle, or one GIF per " +
+                        "puzzle (needs Pillow) (default: png).")
+    parser.add_argument('--duration', type=int, default=200,
+                        help="Milliseconds per GIF frame (default: 200).")
+    args = parser.parse_args()
+
+    os.makedirs(args.output, exist_ok=True)
+    for k, grid in enumerate(_read_puzzles(args.input)[:args.limit]):
+        replay = solve_replay(grid, VARIANTS[args.variant])
+        if replay is None:
+            print('puzzle {} has no solution'.format(k), file=sys.stderr)
+            continue
+        values, assignments = replay
+        frames = Replay(values).frames(assignments, args.steps)
+        if args.format == 'gif':
+            save_gif(frames, os.path.join(args.output, '{:04d}.gif'.format(k)), args.duration)
+        else:
+            save_frames(frames, os.path.join(args.output, '{:04d}'.format(k)), ext=args.format)
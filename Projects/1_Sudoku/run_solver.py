@@ -0,0 +1,170 @@
+"""Solve a file of Sudoku puzzles from the command line
+
+The input is read one line at a time (optionally through a memory map) and the
+solutions are written as soon as they come back from the worker pool, so puzzle
+files of any size can be streamed through the solver:
+
+    python run_solver.py puzzles.txt -o solutions.txt --workers 4
+
+Each non-blank input line that does not start with '#' is one puzzle of 81
+characters, using '.' or '0' for empty boxes. Every puzzle produces exactly one
+output record; puzzles that are malformed or have no solution produce an error
+record (or nothing at all with --errors skip).
+"""
+import argparse
+import json
+import sys
+from collections import deque
+
+from batch import BatchStats, read_lines, solve_many
+from strategies import STRATEGIES
+from topology import DIAGONAL, VARIANTS
+from utils import boxes, cols, rows
+
+GRID_CHARS = frozenset('123456789.')
+
+
+def parse_puzzles(lines, records):
+    """Yield the well-formed puzzles in `lines` and queue a record for every puzzle
+
+    Each record is a list [line number, puzzle, error]; malformed puzzles are
+    queued with an error message and are not yielded to the solver.
+    """
+    for lineno, line in enumerate(lines, 1):
+        if not line or line.startswith('#'):
+            continue
+        grid = line.replace('0', '.')
+        if len(grid) != len(boxes) or not GRID_CHARS.issuperset(grid):
+            records.append([lineno, line, 'malformed puzzle'])
+            continue
+        records.append([lineno, line, None])
+        yield grid
+
+
+def format_grid(lineno, puzzle, solution):
+    return solution
+
+
+def format_pretty(lineno, puzzle, solution):
+    lines = []
+    for r, row in enumerate(rows):
+        cells = solution[r * len(cols):(r + 1) * len(cols)]
+        lines.append(' '.join(cells[:3]) + ' | ' + ' '.join(cells[3:6]) + ' | ' + ' '.join(cells[6:]))
+        if row in 'CF':
+            lines.append('------+-------+------')
+    return '\n'.join(lines) + '\n'
+
+
+def format_json(lineno, puzzle, solution):
+    return json.dumps({'line': lineno, 'puzzle': puzzle, 'solution': solution})
+
+
+def format_error(lineno, puzzle, error, fmt):
+    if fmt == 'json':
+        return json.dumps({'line': lineno, 'puzzle': puzzle, 'error': error})
+    return 'error: line {}: {}: {}'.format(lineno, error, puzzle)
+
+
+FORMATS = {'grid': format_grid, 'pretty': format_pretty, 'json': format_json}
+
+
+def run(lines, out, fmt='grid', errors='line', workers=None, chunksize=256, stats=None,
+        topology=DIAGONAL, strategies=()):
+    """Solve every puzzle in `lines` and write one record per puzzle to `out`
+
+    Parameters
+    ----------
+    lines(iterable)
+        the stripped lines of the input
+
+    out(file)
+        a writable text stream
+
+    fmt(str)
+        one of the keys of FORMATS
+
+    errors(str)
+        'line' to write an error record for malformed or unsolvable puzzles,
+        'skip' to leave them out of the output
+
+    topology(Topology)
+        the units and peers of the variant to solve
+
+    strategies(sequence)
+        names of additional strategies to apply (see `bitboard.reduce_puzzle`)
+
+    Returns
+    -------
+    int
+        the number of puzzles that could not be solved
+    """
+    formatter = FORMATS[fmt]
+    records = deque()
+    failures = 0
+
+    def write(lineno, puzzle, solution, error):
+        nonlocal failures
+        if error is None:
+            out.write(formatter(lineno, puzzle, solution) + '\n')
+            return
+        failures += 1
+        if errors == 'line':
+            out.write(format_error(lineno, puzzle, error, fmt) + '\n')
+
+    results = solve_many(parse_puzzles(lines, records), workers=workers,
+                         chunksize=chunksize, stats=stats, topology=topology, strategies=strategies)
+    for solution in results:
+        # malformed puzzles never reach the solver; flush their records until
+        # the record that this solution belongs to
+        while records[0][2] is not None:
+            lineno, puzzle, error = records.popleft()
+            write(lineno, puzzle, None, error)
+        lineno, puzzle, _ = records.popleft()
+        write(lineno, puzzle, solution, None if solution else 'no solution')
+    while records:
+        lineno, puzzle, error = records.popleft()
+        write(lineno, puzzle, None, error)
+    return failures
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Solve a file of Sudoku puzzles with one " +
+        "puzzle per line, streaming the solutions to the output as they are found.")
+    parser.add_argument('input', help="Path of the puzzle file, or '-' to read from stdin.")
+    parser.add_argument('-o', '--output', default='-',
+                        help="Path of the output file (default: stdout).")
+    parser.add_argument('-f', '--format', choices=sorted(FORMATS), default='grid',
+                        help="Output format for solved puzzles (default: grid).")
+    parser.add_argument('-e', '--errors', choices=['line', 'skip'], default='line',
+                        help="Write an error record for malformed or unsolvable puzzles, " +
+                        "or skip them (default: line).")
+    parser.add_argument('-v', '--variant', choices=sorted(VARIANTS), default='diagonal',
+                        help="Sudoku variant of the puzzles (default: diagonal).")
+    parser.add_argument('-s', '--strategies', nargs='+', choices=list(STRATEGIES), default=(),
+                        metavar='STRATEGY',
+                        help="Additional strategies to apply in order when propagation stalls. " +
+                        "Choose from: {}".format(", ".join(STRATEGIES)))
+    parser.add_argument('-w', '--workers', type=int, default=None,
+                        help="Number of worker processes (default: number of CPUs).")
+    parser.add_argument('-c', '--chunksize', type=int, default=256,
+                        help="Number of puzzles sent to a worker at a time (default: 256).")
+    parser.add_argument('--mmap', action='store_true',
+                        help="Read the input file through a memory map.")
+    parser.add_argument('-q', '--quiet', action='store_true',
+                        help="Do not print throughput statistics to stderr.")
+    args = parser.parse_args()
+
+    if args.input == '-':
+        lines = (line.strip() for line in sys.stdin)
+    else:
+        lines = read_lines(args.input, use_mmap=args.mmap)
+    out = sys.stdout if args.output == '-' else open(args.output, 'w')
+    stats = BatchStats()
+    try:
+        failures = run(lines, out, args.format, args.errors, args.workers, args.chunksize, stats,
+                       VARIANTS[args.variant], args.strategies)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    if not args.quiet:
+        print('{}; {} puzzles not solved'.format(stats, failures), file=sys.stderr)
@@ -1,24 +1,19 @@
 from utils import *
 from collections import Counter
+from topology import get_topology, row_units, column_units, square_units, diagonal_units
 
-row_units = [cross(r, cols) for r in rows]
-column_units = [cross(rows, c) for c in cols]
-square_units = [cross(rs, cs) for rs in ('ABC', 'DEF', 'GHI')
-                for cs in ('123', '456', '789')]
-unitlist = row_units + column_units + square_units
 
-# TODO: Update the unit list to add the new diagonal units
-diagonal_units = list(
-    map(list, zip(*[[r+c1, r+c2] for r, c1, c2 in zip(rows, cols, cols[::-1])])))
-unitlist += diagonal_units
+# The diagonal units are added to a new list so that the regular units defined in
+# topology.py are never mutated and both variants can be solved in one process
+unitlist = row_units + column_units + square_units + diagonal_units
 
+# The unit and peer tables are computed once per unit definition and shared
+diagonal_topology = get_topology(unitlist)
+units = diagonal_topology.units
+peers = diagonal_topology.peers
 
-# Must be called after all units (including diagonals) are added to the unitlist
-units = extract_units(unitlist, boxes)
-peers = extract_peers(units, boxes)
 
-
-def naked_twins(values):
+def naked_twins(values, topology=diagonal_topology, history=None):
     """Eliminate values using the naked twins strategy.
 
     The naked twins strategy says that if you have two or more unallocated boxes
@@ -31,6 +26,12 @@ def naked_twins(values):
     values(dict)
         a dictionary of the form {'box_name': '123456789', ...}
 
+    topology(Topology)
+        the units and peers of the variant to solve (default: diagonal sudoku)
+
+    history(History)
+        if given, every assignment is recorded in it (see utils.assign_value)
+
     Returns
     -------
     dict
@@ -51,7 +52,7 @@ def naked_twins(values):
     strategy repeatedly).
     """
     # TODO: Implement this function!
-    for unit in unitlist:
+    for unit in topology.unitlist:
         # find naked twins
         naked_twins = Counter()
         for box in unit:
@@ -64,12 +65,12 @@ def naked_twins(values):
                 for box in unit:
                     val = values[box]
                     if len(val) > 1 and val != naked_twin:
-                        values[box] = val.replace(naked_twin[0], "").replace(
-                            naked_twin[1], "")
+                        assign_value(values, box, val.replace(naked_twin[0], "").replace(
+                            naked_twin[1], ""), history)
     return values
 
 
-def eliminate(values):
+def eliminate(values, topology=diagonal_topology, history=None):
     """Apply the eliminate strategy to a Sudoku puzzle
 
     The eliminate strategy says that if a box has a value assigned, then none
@@ -80,6 +81,12 @@ def eliminate(values):
     values(dict)
         a dictionary of the form {'box_name': '123456789', ...}
 
+    topology(Topology)
+        the units and peers of the variant to solve (default: diagonal sudoku)
+
+    history(History)
+        if given, every assignment is recorded in it (see utils.assign_value)
+
     Returns
     -------
     dict
@@ -89,12 +96,13 @@ def eliminate(values):
     tmp = values.copy()
     for box, digit in tmp.items():
         if len(digit) == 1:
-            for peer in peers[box]:
-                values[peer] = values[peer].replace(digit, '')
+            for peer in topology.peers[box]:
+                if digit in values[peer]:
+                    assign_value(values, peer, values[peer].replace(digit, ''), history)
     return values
 
 
-def only_choice(values):
+def only_choice(values, topology=diagonal_topology, history=None):
     """Apply the only choice strategy to a Sudoku puzzle
 
     The only choice strategy says that if only one box in a unit allows a certain
@@ -105,6 +113,12 @@ def only_choice(values):
     values(dict)
         a dictionary of the form {'box_name': '123456789', ...}
 
+    topology(Topology)
+        the units and peers of the variant to solve (default: diagonal sudoku)
+
+    history(History)
+        if given, every assignment is recorded in it (see utils.assign_value)
+
     Returns
     -------
     dict
@@ -115,15 +129,15 @@ def only_choice(values):
     You should be able to complete this function by copying your code from the classroom
     """
     # TODO: Copy your code from the classroom to complete this function
-    for unit in unitlist:
-        for digit in '123456789':
+    for unit in topology.unitlist:
+        for digit in topology.digits:
             dplaces = [box for box in unit if digit in values[box]]
             if len(dplaces) == 1:
-                values[dplaces[0]] = digit
+                assign_value(values, dplaces[0], digit, history)
     return values
 
 
-def reduce_puzzle(values):
+def reduce_puzzle(values, topology=diagonal_topology, history=None):
     """Reduce a Sudoku puzzle by repeatedly applying all constraint strategies
 
     Parameters
@@ -131,6 +145,12 @@ def reduce_puzzle(values):
     values(dict)
         a dictionary of the form {'box_name': '123456789', ...}
 
+    topology(Topology)
+        the units and peers of the variant to solve (default: diagonal sudoku)
+
+    history(History)
+        if given, every assignment is recorded in it (see utils.assign_value)
+
     Returns
     -------
     dict or False
@@ -143,11 +163,11 @@ def reduce_puzzle(values):
         # Check how many boxes have a determined value
         solved_values_before = sum(len(val) == 1 for val in values.values())
         # Your code here: Use the Eliminate Strategy
-        values = eliminate(values)
+        values = eliminate(values, topology, history)
         #
-        values = naked_twins(values)
+        values = naked_twins(values, topology, history)
         # Your code here: Use the Only Choice Strategy
-        values = only_choice(values)
+        values = only_choice(values, topology, history)
         # Check how many boxes have a determined value, to compare
         solved_values_after = sum(len(val) == 1 for val in values.values())
         # If no new values were added, stop the loop.
@@ -158,7 +178,7 @@ def reduce_puzzle(values):
     return values
 
 
-def search(values):
+def search(values, topology=diagonal_topology, history=None):
     """Apply depth first search to solve Sudoku puzzles in order to solve puzzles
     that cannot be solved by repeated reduction alone.
 
@@ -167,6 +187,12 @@ def search(values):
     values(dict)
         a dictionary of the form {'box_name': '123456789', ...}
 
+    topology(Topology)
+        the units and peers of the variant to solve (default: diagonal sudoku)
+
+    history(History)
+        if given, every assignment is recorded in it (see utils.assign_value)
+
     Returns
     -------
     dict or False
@@ -179,7 +205,7 @@ def search(values):
     """
     # TODO: Copy your code from the classroom to complete this function
     # First, reduce the puzzle using the previous function
-    values = reduce_puzzle(values)
+    values = reduce_puzzle(values, topology, history)
     if values is False:
         return False
     if all(len(val) == 1 for val in values.values()):
@@ -189,13 +215,13 @@ def search(values):
     # Now use recursion to solve each one of the resulting sudokus, and if one returns a value (not False), return that answer!
     for digit in values[s]:
         new_sudoku = values.copy()
-        new_sudoku[s] = digit
-        attempt = search(new_sudoku)
+        assign_value(new_sudoku, s, digit, history)
+        attempt = search(new_sudoku, topology, history)
         if attempt:
             return attempt
 
 
-def solve(grid):
+def solve(grid, topology=diagonal_topology, method='search', history=None):
     """Find the solution to a Sudoku puzzle using search and constraint propagation
 
     Parameters
@@ -205,13 +231,38 @@ def solve(grid):
 
         Ex. '2.............62....1....7...6..8...3...9...7...6..4...4....8....52.............3'
 
+    topology(Topology)
+        the units and peers of the variant to solve (default: diagonal sudoku)
+
+    method(string)
+        'search' to use the functions in this file, 'bitboard' to use the
+        bitmask engine in bitboard.py, or 'dlx' to use the exact cover search
+        in dlx.py
+
+    history(History)
+        if given, the 'search' method records every assignment in it so that
+        the solution can be replayed with `reconstruct` (see utils.History).
+        The other methods do not assign boxes one at a time, so passing a
+        history with them raises ValueError
+
     Returns
     -------
     dict or False
         The dictionary representation of the final sudoku grid or False if no solution exists.
     """
+    if history is not None and method != 'search':
+        raise ValueError("history can only be recorded by the 'search' method, got {!r}".format(method))
+    # the other engines are imported here so that this file still works on its own
+    if method == 'bitboard':
+        import bitboard
+        return bitboard.solve(grid, topology)
+    if method == 'dlx':
+        import dlx
+        return dlx.solve(grid, topology)
+    if method != 'search':
+        raise ValueError("method must be 'search', 'bitboard' or 'dlx', got {!r}".format(method))
     values = grid2values(grid)
-    values = search(values)
+    values = search(values, topology, history)
     return values
 
 
@@ -234,7 +285,8 @@ def test_naked_twins():
 if __name__ == "__main__":
     diag_sudoku_grid = '2.............62....1....7...6..8...3...9...7...6..4...4....8....52.............3'
     display(grid2values(diag_sudoku_grid))
-    result = solve(diag_sudoku_grid)
+    history = History()
+    result = solve(diag_sudoku_grid, history=history)
     display(result)
 
     try:
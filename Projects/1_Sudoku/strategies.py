@@ -0,0 +1,209 @@
+"""Advanced Sudoku strategies for the bitmask engine
+
+`bitboard.propagate` already applies eliminate (naked singles), only choice
+(hidden singles) and naked twins (naked pairs) every time a box changes. The
+strategies in this module are more expensive deductions that only run when
+propagation stalls: `bitboard.reduce_puzzle` and `bitboard.search` take a
+sequence of strategy names and try them in that order, propagating again and
+starting over from the first strategy as soon as one of them makes progress.
+
+Every strategy has the signature ``strategy(board, topology, trail, changed)``.
+It removes candidates from `board` in place, records every change on `trail`
+(if not None) for backtracking, appends the index of every changed box to
+`changed` and returns the number of candidates it eliminated.
+"""
+from collections import OrderedDict
+from functools import lru_cache
+from itertools import combinations
+
+
+def _popcount(m):
+    return bin(m).count('1')
+
+
+def _remove(board, i, mask, trail, changed):
+    """Remove the candidates in `mask` from box `i`; return how many were removed"""
+    m = board[i]
+    removed = m & mask
+    if not removed:
+        return 0
+    if trail is not None:
+        trail.append((i, m))
+    board[i] = m ^ removed
+    changed.append(i)
+    return _popcount(removed)
+
+
+def _naked_subsets(board, topology, trail, changed, k):
+    eliminated = 0
+    for unit in topology.unit_cells:
+        open_cells = [i for i in unit if board[i] & (board[i] - 1)]
+        if len(open_cells) <= k:
+            continue
+        small = [i for i in open_cells if _popcount(board[i]) <= k]
+        for subset in combinations(small, k):
+            union = 0
+            for i in subset:
+                union |= board[i]
+            if _popcount(union) != k:
+                continue
+            for i in open_cells:
+                if i not in subset:
+                    eliminated += _remove(board, i, union, trail, changed)
+    return eliminated
+
+
+def _hidden_subsets(board, topology, trail, changed, k):
+    digits = range(len(topology.digits))
+    eliminated = 0
+    for unit in topology.unit_cells:
+        # the places left in the unit for each digit that is not placed yet
+        places = {}
+        for d in digits:
+            bit = 1 << d
+            cells = tuple(i for i in unit if board[i] & bit)
+            if 2 <= len(cells) <= k:
+                places[bit] = cells
+        if len(places) < k:
+            continue
+        for bits in combinations(places, k):
+            cells = set()
+            for bit in bits:
+                cells.update(places[bit])
+            if len(cells) != k:
+                continue
+            keep = sum(bits)
+            for i in cells:
+                eliminated += _remove(board, i, ~keep, trail, changed)
+    return eliminated
+
+
+def naked_triples(board, topology, trail, changed):
+    """Three boxes of a unit whose candidates together are three digits
+
+    None of the other boxes in the unit can hold those digits.
+    """
+    return _naked_subsets(board, topology, trail, changed, 3)
+
+
+def hidden_pairs(board, topology, trail, changed):
+    """Two digits that only fit in the same two boxes of a unit
+
+    Those boxes cannot hold any other digit.
+    """
+    return _hidden_subsets(board, topology, trail, changed, 2)
+
+
+def hidden_triples(board, topology, trail, changed):
+    """Three digits that only fit in the same three boxes of a unit
+
+    Those boxes cannot hold any other digit.
+    """
+    return _hidden_subsets(board, topology, trail, changed, 3)
+
+
+@lru_cache(maxsize=None)
+def _intersections(topology):
+    """Return (source kind, target kind, shared, source rest, target rest) for
+    every ordered pair of units that share two or more boxes"""
+    units = topology.unit_cells
+    kinds = topology.unit_kinds
+    result = []
+    for u, v in combinations(range(len(units)), 2):
+        shared = set(units[u]) & set(units[v])
+        if len(shared) < 2:
+            continue
+        u_rest = tuple(i for i in units[u] if i not in shared)
+        v_rest = tuple(i for i in units[v] if i not in shared)
+        shared = tuple(sorted(shared))
+        result.append((kinds[u], kinds[v], shared, u_rest, v_rest))
+        result.append((kinds[v], kinds[u], shared, v_rest, u_rest))
+    return tuple(result)
+
+
+def _locked_candidates(board, topology, trail, changed, from_square):
+    eliminated = 0
+    for source_kind, target_kind, shared, source_rest, target_rest in _intersections(topology):
+        if (source_kind == 'square') != from_square or (target_kind == 'square') == from_square:
+            continue
+        inside = outside = 0
+        for i in shared:
+            inside |= board[i]
+        for i in source_rest:
+            outside |= board[i]
+        # digits that only fit in the intersection within the source unit
+        locked = inside & ~outside
+        if locked:
+            for i in target_rest:
+                eliminated += _remove(board, i, locked, trail, changed)
+    return eliminated
+
+
+def pointing_pairs(board, topology, trail, changed):
+    """Digits confined to one line within a square
+
+    If every place left for a digit in a square is on the same row, column or
+    diagonal, the digit is removed from the rest of that line.
+    """
+    return _locked_candidates(board, topology, trail, changed, True)
+
+
+def box_line_reduction(board, topology, trail, changed):
+    """Digits confined to one square within a line
+
+    If every place left for a digit in a row, column or diagonal is inside the
+    same square, the digit is removed from the rest of that square.
+    """
+    return _locked_candidates(board, topology, trail, changed, False)
+
+
+@lru_cache(maxsize=None)
+def _lines(topology):
+    """Return the row and column units, and the row and column unit of every box"""
+    kinds = topology.unit_kinds
+    rows = tuple(u for u, kind in enumerate(kinds) if kind == 'row')
+    columns = tuple(u for u, kind in enumerate(kinds) if kind == 'column')
+    row_of, column_of = {}, {}
+    for u in rows:
+        row_of.update((i, u) for i in topology.unit_cells[u])
+    for u in columns:
+        column_of.update((i, u) for i in topology.unit_cells[u])
+    return rows, columns, row_of, column_of
+
+
+def x_wing(board, topology, trail, changed):
+    """A digit that fits in exactly the same two columns of two rows
+
+    The digit must be in those columns on those two rows, so it is removed from
+    every other box of both columns (and the same with rows and columns swapped).
+    """
+    rows, columns, row_of, column_of = _lines(topology)
+    units = topology.unit_cells
+    eliminated = 0
+    for bases, cover_of in ((rows, column_of), (columns, row_of)):
+        for d in range(len(topology.digits)):
+            bit = 1 << d
+            by_covers = {}
+            for u in bases:
+                covers = tuple(cover_of[i] for i in units[u] if board[i] & bit)
+                if len(covers) == 2:
+                    by_covers.setdefault(covers, []).append(u)
+            for covers, pair in by_covers.items():
+                if len(pair) != 2:
+                    continue
+                base_cells = set(units[pair[0]]) | set(units[pair[1]])
+                for c in covers:
+                    for i in units[c]:
+                        if i not in base_cells:
+                            eliminated += _remove(board, i, bit, trail, changed)
+    return eliminated
+
+
+STRATEGIES = OrderedDict([
+    ('hidden_pairs', hidden_pairs),
+    ('naked_triples', naked_triples),
+    ('hidden_triples', hidden_triples),
+    ('pointing_pairs', pointing_pairs),
+    ('box_line_reduction', box_line_reduction),
+    ('x_wing', x_wing),
+])
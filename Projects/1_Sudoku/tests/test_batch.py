@@ -0,0 +1,57 @@
+import os
+import tempfile
+import unittest
+
+import batch
+from tests import test_solution
+
+
+class TestSolveMany(unittest.TestCase):
+    diagonal_grid = test_solution.TestDiagonalSudoku.diagonal_grid
+    unsolvable_grid = '11' + '.' * 79
+    grids = [diagonal_grid, unsolvable_grid, '123456...' + '.' * 72] * 5
+
+    def expected(self):
+        return [batch.solve_grid(grid) for grid in self.grids]
+
+    def test_solve_grid(self):
+        solved = batch.solve_grid(self.diagonal_grid)
+        values = test_solution.TestDiagonalSudoku.solved_diag_sudoku
+        self.assertEqual(solved, ''.join(values[box] for box in batch.DIAGONAL.boxes))
+        self.assertFalse(batch.solve_grid(self.unsolvable_grid))
+        self.assertRaises(ValueError, batch.solve_grid, '123')
+        self.assertEqual(batch.solve_grid(self.diagonal_grid.replace('.', '0')), solved)
+        self.assertRaises(ValueError, batch.solve_grid, self.diagonal_grid.replace('.', 'x', 1))
+
+    def test_single_process(self):
+        self.assertEqual(list(batch.solve_many(self.grids, workers=1)), self.expected())
+
+    def test_process_pool_keeps_order(self):
+        results = batch.solve_many(iter(self.grids), workers=2, chunksize=2)
+        self.assertEqual(list(results), self.expected())
+
+    def test_stats(self):
+        stats = batch.BatchStats()
+        list(batch.solve_many(self.grids, workers=1, stats=stats))
+        self.assertEqual(stats.puzzles, len(self.grids))
+        self.assertEqual(stats.failed, 5)
+        self.assertEqual(stats.solved, 10)
+        self.assertGreater(stats.rate, 0)
+
+    def test_read_from_file(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'puzzles.txt')
+            with open(path, 'w') as f:
+                f.write('# comment\n\n' + '\n'.join(self.grids) + '\n')
+            self.assertEqual(list(batch.solve_many(path, workers=2)), self.expected())
+
+    def test_zero_blanks_from_file(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'puzzles.txt')
+            with open(path, 'w') as f:
+                f.write('\n'.join(grid.replace('.', '0') for grid in self.grids) + '\n')
+            self.assertEqual(list(batch.solve_many(path, workers=2)), self.expected())
+
+
+if __name__ == '__main__':
+    unittest.main()
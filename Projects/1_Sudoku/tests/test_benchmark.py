@@ -0,0 +1,66 @@
+import unittest
+
+import benchmark
+import bitboard
+from strategies import STRATEGIES
+
+
+class TestCorpora(unittest.TestCase):
+
+    def test_tiers(self):
+        for tier in benchmark.TIERS:
+            grids = benchmark.load_tier(tier)
+            self.assertTrue(grids, tier)
+            for grid in grids:
+                self.assertEqual(len(grid), 81, tier)
+                self.assertTrue(set(grid) <= set('123456789.'), tier)
+        for grid in benchmark.load_tier('17-clue'):
+            self.assertEqual(sum(c != '.' for c in grid), 17)
+        self.assertRaises(ValueError, benchmark.load_tier, 'impossible')
+
+    def test_hard_tier_needs_search(self):
+        for grid in benchmark.load_tier('hard'):
+            stats = bitboard.SolveStats()
+            board = bitboard.search(bitboard.grid2board(grid, benchmark.REGULAR), inplace=True,
+                                    topology=benchmark.REGULAR, counters=stats)
+            self.assertTrue(board, grid)
+            self.assertGreater(stats['nodes'], 0, grid)
+
+
+class TestBenchmark(unittest.TestCase):
+
+    def test_run_benchmark(self):
+        grids = benchmark.load_tier('hard')[:3]
+        for engine in benchmark.ENGINES:
+            result = benchmark.run_benchmark(grids, engine=engine, tier='hard')
+            self.assertEqual(result.puzzles, 3)
+            self.assertEqual(result.solved, 3, engine)
+            self.assertGreater(result.rate, 0)
+            self.assertEqual(len(benchmark.format_result(result).split()), 12)
+
+    def test_counters(self):
+        grids = benchmark.load_tier('hard')[:3]
+        result = benchmark.run_benchmark(grids, strategies=['hidden_pairs'])
+        self.assertGreater(result.nodes, 0)
+        self.assertGreater(result.eliminated, 0)
+        self.assertGreater(result.stats['hidden_pairs'], 0)
+        self.assertRaises(ValueError, benchmark.run_benchmark, grids, engine='dlx',
+                          strategies=['hidden_pairs'])
+
+    def test_percentile(self):
+        values = list(range(1, 101))
+        self.assertEqual(benchmark.percentile(values, 50), 50)
+        self.assertEqual(benchmark.percentile(values, 99), 99)
+        self.assertEqual(benchmark.percentile([3.0], 99), 3.0)
+        self.assertEqual(benchmark.percentile([], 50), 0.0)
+
+    def test_parse_strategies(self):
+        self.assertEqual(benchmark.parse_strategies('none'), ())
+        self.assertEqual(benchmark.parse_strategies('all'), tuple(STRATEGIES))
+        self.assertEqual(benchmark.parse_strategies('x_wing,hidden_pairs'),
+                         ('x_wing', 'hidden_pairs'))
+        self.assertRaises(ValueError, benchmark.parse_strategies, 'guess')
+
+
+if __name__ == '__main__':
+    unittest.main()
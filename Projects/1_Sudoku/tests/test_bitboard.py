@@ -0,0 +1,233 @@
+import unittest
+
+import bitboard
+import solution
+import topology
+from utils import grid2values
+from tests import test_solution
+
+
+class TestConversions(unittest.TestCase):
+
+    def test_grid_roundtrip(self):
+        grid = test_solution.TestDiagonalSudoku.diagonal_grid
+        self.assertEqual(bitboard.board2grid(bitboard.grid2board(grid)), grid)
+        self.assertRaises(ValueError, bitboard.grid2board, grid.replace('.', '0'))
+
+    def test_values_roundtrip(self):
+        values = test_solution.TestNakedTwins.before_naked_twins_1
+        self.assertEqual(bitboard.board2values(bitboard.values2board(values)), values)
+
+    def test_grid2board_matches_grid2values(self):
+        grid = test_solution.TestDiagonalSudoku.diagonal_grid
+        self.assertEqual(bitboard.board2values(bitboard.grid2board(grid)), grid2values(grid))
+
+
+class TestStrategies(unittest.TestCase):
+
+    def test_naked_twins(self):
+        for before, solutions in ((test_solution.TestNakedTwins.before_naked_twins_1, test_solution.TestNakedTwins.possible_solutions_1),
+                                  (test_solution.TestNakedTwins.before_naked_twins_2, test_solution.TestNakedTwins.possible_solutions_2)):
+            board = bitboard.naked_twins(bitboard.values2board(before))
+            self.assertIn(bitboard.board2values(board), solutions)
+
+    def test_eliminate_matches_dict_engine(self):
+        values = grid2values(test_solution.TestDiagonalSudoku.diagonal_grid)
+        board = bitboard.eliminate(bitboard.values2board(values))
+        self.assertEqual(bitboard.board2values(board), solution.eliminate(values))
+
+
+class TestPropagate(unittest.TestCase):
+
+    def sweep(self, board):
+        """Apply the three sweeping strategies until the board stops changing"""
+        while True:
+            before = board[:]
+            bitboard.eliminate(board)
+            bitboard.naked_twins(board)
+            bitboard.only_choice(board)
+            if board == before:
+                return board
+
+    def test_same_fixed_point_as_sweeping(self):
+        grid = test_solution.TestDiagonalSudoku.diagonal_grid
+        board = bitboard.grid2board(grid)
+        board[1] = board[2] = 0b1100000  # '67'
+        expected = self.sweep(board[:])
+        self.assertEqual(bitboard.reduce_puzzle(board), expected)
+
+    def test_propagate_from_single_assignment(self):
+        board = bitboard.reduce_puzzle(bitboard.grid2board('123456...' + '.' * 72))
+        s = 40
+        board[s] &= -board[s]
+        expected = self.sweep(board[:])
+        self.assertEqual(bitboard.propagate(board, [s]), expected)
+
+    def test_contradiction(self):
+        board = bitboard.grid2board('1' * 2 + '.' * 79)
+        self.assertFalse(bitboard.reduce_puzzle(board))
+
+
+class TestSolve(unittest.TestCase):
+
+    def test_solve(self):
+        self.assertEqual(bitboard.solve(test_solution.TestDiagonalSudoku.diagonal_grid),
+                         test_solution.TestDiagonalSudoku.solved_diag_sudoku)
+
+    def test_search_inplace(self):
+        grid = '123456...' + '.' * 72
+        expected = bitboard.search(bitboard.grid2board(grid))
+        board = bitboard.grid2board(grid)
+        self.assertIs(bitboard.search(board, inplace=True), board)
+        self.assertEqual(board, expected)
+
+    def test_search_inplace_restores_unsolvable_board(self):
+        board = bitboard.grid2board('1.' + '1' * 7 + '.' * 72)
+        before = board[:]
+        self.assertFalse(bitboard.search(board, inplace=True))
+        self.assertEqual(board, before)
+
+    def test_undo(self):
+        board = bitboard.grid2board('.' * 81)
+        before = board[:]
+        trail = []
+        board[0] = 0b10000  # '5'
+        trail.append((0, before[0]))
+        bitboard.propagate(board, [0], trail)
+        self.assertNotEqual(board, before)
+        bitboard.undo(board, trail)
+        self.assertEqual(board, before)
+        self.assertEqual(trail, [])
+
+    def test_unsolvable(self):
+        grid = '11' + '.' * 79
+        self.assertFalse(bitboard.solve(grid))
+
+    def test_count_solutions(self):
+        grid = test_solution.TestDiagonalSudoku.diagonal_grid
+        self.assertEqual(bitboard.count_solutions(grid), 1)
+        self.assertTrue(bitboard.is_unique(grid))
+        self.assertEqual(bitboard.count_solutions('11' + '.' * 79), 0)
+        self.assertEqual(bitboard.count_solutions('.' * 81), 2)
+        self.assertFalse(bitboard.is_unique('.' * 81))
+        self.assertEqual(bitboard.count_solutions('.' * 81, limit=50), 50)
+        self.assertEqual(bitboard.count_solutions('.' * 16, topology.regular_topology(2), limit=None),
+                         288)
+
+
+class TestSolveStats(unittest.TestCase):
+    hard_grid = '8..........36......7..9.2...5...7.......457.....1...3...1....68..85...1..9....4..'
+
+    def test_search_stats(self):
+        stats = bitboard.SolveStats()
+        board = bitboard.search(bitboard.grid2board(self.hard_grid, topology.REGULAR), inplace=True,
+                                topology=topology.REGULAR, strategies=['hidden_pairs'],
+                                counters=stats)
+        self.assertTrue(board)
+        self.assertGreater(stats['nodes'], stats['backtracks'])
+        self.assertGreater(stats['backtracks'], 0)
+        self.assertGreater(stats['max_depth'], 1)
+        self.assertLessEqual(stats['max_depth'], stats['nodes'])
+        self.assertGreater(stats.eliminations['hidden_pairs'], 0)
+        self.assertNotIn('nodes', stats.eliminations)
+        self.assertGreater(stats.times['total'], stats.times['propagate'])
+        self.assertGreater(stats.times['hidden_pairs'], 0)
+        self.assertIn('max_depth=', stats.summary())
+
+    def test_copying_search_matches(self):
+        stats, inplace_stats = bitboard.SolveStats(), bitboard.SolveStats()
+        bitboard.search(bitboard.grid2board(self.hard_grid, topology.REGULAR),
+                        topology=topology.REGULAR, counters=stats)
+        bitboard.search(bitboard.grid2board(self.hard_grid, topology.REGULAR), inplace=True,
+                        topology=topology.REGULAR, counters=inplace_stats)
+        self.assertEqual(dict(stats), dict(inplace_stats))
+
+    def test_merge(self):
+        stats = bitboard.SolveStats(nodes=3, max_depth=2, eliminate=10)
+        other = bitboard.SolveStats(nodes=1, max_depth=5)
+        other.times['total'] = 1.5
+        stats.merge(other)
+        self.assertEqual(stats['nodes'], 4)
+        self.assertEqual(stats['max_depth'], 5)
+        self.assertEqual(stats.as_dict()['eliminations'], {'eliminate': 10})
+        self.assertEqual(stats.times['total'], 1.5)
+
+
+class TestLargerBoards(unittest.TestCase):
+    grid_4x4 = '1...' '..2.' '.3..' '...4'
+    grid_16x16 = (
+        '..4..79..G8.23.5'
+        '8..GB...97F..CE4'
+        'F.97EC4.........'
+        'B.5...AD4C...7..'
+        '2.E5..F.84..79.B'
+        '6C84.9B7....3...'
+        '17.9..8.E..3G.DF'
+        '.GF...E3.9....6.'
+        '......7FG..8....'
+        '4.G.....7.A...5.'
+        'AF715.CE...B.D4G'
+        '.B3..DG8C6.....7'
+        '..6E......C...7.'
+        'G.1F3E...B.94..D'
+        '..D87...1F..5E..'
+        '.92B..D...35....')
+    grid_25x25 = (
+        'G.4L..AN..3I.K.CD.....H..'
+        'JN8.5E.D.CH..2.B.F.I41G..'
+        '.27.M.L..4.OCD.8.5..B..IK'
+        '.KB.F..2M7...N54P1.LC6EO.'
+        'ED.O6.IKF.G..P.7.MH9.5JAN'
+        'DO6...C.3FP..LGM.H2.5JN4.'
+        'P.17GN4AJ5KCF..6..D8.....'
+        'N..4JD.OE6..M..FI...1GP7.'
+        'KIFC..B9.M.45..1L.P.6.D8O'
+        '.9M.H.7.G..8.OE5AJN4F3K.I'
+        '.8.5D.6C....G7.HB29FJN..4'
+        '.C36....2HA1...G...ME..58'
+        '...MP.1.N.I63..E8...H29FB'
+        '9BH..LM7PGO5E8..4NA1.KI6C'
+        'A..1.O58DE..HB2..KI6G.L.7'
+        'BF239.HMLP8JD.ON1....ICE.'
+        '.6KE.B.F924GN1..ML7.DO8..'
+        '85D.O..6.K...M.2F......G.'
+        '.1..A8.5O.....9.6I....7HM'
+        '7M.HL4G..N.EK.ID5.8J2.B3.'
+        '.E.DCFK..91PAG...7..O8...'
+        '5.O.86.E.IM2L.7...FKA.1PG'
+        'F...BM2H7L5.O..AG...IC6..'
+        '..AP45N..OFK93BI.C.DL.M2.'
+        'M.L..1PG4A.DIE...8.N.BFK.')
+
+    def assertSolved(self, grid, values, top):
+        for box, clue in zip(top.boxes, grid):
+            if clue != '.':
+                self.assertEqual(values[box], clue)
+        for unit in top.unitlist:
+            self.assertEqual(sorted(values[box] for box in unit), sorted(top.digits))
+
+    def test_topologies(self):
+        for box_size in (2, 3, 4, 5):
+            top = topology.regular_topology(box_size)
+            n = box_size ** 2
+            self.assertEqual(len(top.boxes), n * n)
+            self.assertEqual(len(top.unitlist), 3 * n)
+            self.assertEqual(len(top.peers[top.boxes[0]]), 3 * n - 2 * box_size - 1)
+        self.assertEqual(topology.regular_topology(4).boxes[-1], 'P16')
+        self.assertRaises(ValueError, topology.regular_topology, 6)
+
+    def test_solve(self):
+        for grid, box_size in ((self.grid_4x4, 2), (self.grid_16x16, 4), (self.grid_25x25, 5)):
+            top = topology.regular_topology(box_size)
+            values = bitboard.solve(grid, top)
+            self.assertTrue(values)
+            self.assertSolved(grid, values, top)
+
+    def test_diagonal_16x16(self):
+        top = topology.regular_topology(4, diagonal=True)
+        values = bitboard.solve('.' * 256, top)
+        self.assertSolved('.' * 256, values, top)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,139 @@
+import os
+import random
+import shutil
+import tempfile
+import time
+import unittest
+
+import benchmark
+import bitboard
+import canonical
+from topology import DIAGONAL, REGULAR, regular_topology
+
+
+def shuffle(grid, rng):
+    """Apply a random validity preserving transformation of a regular 9x9 puzzle"""
+    def lines():
+        bands = list(range(3))
+        rng.shuffle(bands)
+        order = []
+        for band in bands:
+            rows = list(range(band * 3, band * 3 + 3))
+            rng.shuffle(rows)
+            order += rows
+        return order
+    rows, cols = lines(), lines()
+    cells = [r * 9 + c for r in rows for c in cols]
+    if rng.random() < 0.5:
+        cells = [cells[c * 9 + r] for r in range(9) for c in range(9)]
+    digits = list('123456789')
+    rng.shuffle(digits)
+    rename = dict(zip('123456789', digits))
+    return ''.join(rename.get(grid[k], '.') for k in cells)
+
+
+def rotate(grid):
+    return ''.join(grid[(8 - c) * 9 + r] for r in range(9) for c in range(9))
+
+
+class TestCanonicalForm(unittest.TestCase):
+
+    def test_equivalent_puzzles(self):
+        rng = random.Random(0)
+        for grid in benchmark.load_tier('hard')[:10]:
+            form = canonical.canonical_form(grid, REGULAR)[0]
+            for _ in range(3):
+                self.assertEqual(canonical.canonical_form(shuffle(grid, rng), REGULAR)[0], form)
+
+    def test_diagonal(self):
+        grid = benchmark.load_tier('diagonal')[0]
+        form = canonical.canonical_form(grid, DIAGONAL)[0]
+        self.assertEqual(canonical.canonical_form(rotate(grid), DIAGONAL)[0], form)
+        self.assertEqual(canonical.canonical_form(grid.replace('1', 'x').replace('2', '1')
+                                                  .replace('x', '2'), DIAGONAL)[0], form)
+
+    def test_sparse_large_grids(self):
+        # nearly every line ties, so only `limit` of the transformations are tried
+        for box_size, grid in ((4, '.' * 256), (5, '1' + '.' * 623 + '2')):
+            topology = regular_topology(box_size)
+            start = time.perf_counter()
+            form, cells, labels = canonical.canonical_form(grid, topology)
+            self.assertLess(time.perf_counter() - start, 2.0)
+            self.assertEqual(canonical.restore(form, cells, labels), grid)
+
+    def test_restore(self):
+        grid = benchmark.load_tier('hard')[0]
+        form, cells, labels = canonical.canonical_form(grid, REGULAR)
+        self.assertEqual(canonical.restore(form, cells, labels), grid)
+        solved = bitboard.board2grid(bitboard.search(bitboard.grid2board(form, REGULAR),
+                                                     topology=REGULAR), REGULAR)
+        restored = canonical.restore(solved, cells, labels)
+        self.assertEqual(restored, bitboard.board2grid(
+            bitboard.search(bitboard.grid2board(grid, REGULAR), topology=REGULAR), REGULAR))
+
+    def test_missing_digit(self):
+        solution = bitboard.board2grid(bitboard.search(bitboard.grid2board(
+            benchmark.load_tier('hard')[0], REGULAR), topology=REGULAR), REGULAR)
+        grid = solution.replace('9', '.')
+        form, cells, labels = canonical.canonical_form(grid, REGULAR)
+        self.assertNotIn('9', labels)
+        solved = bitboard.board2grid(bitboard.search(bitboard.grid2board(form, REGULAR),
+                                                     topology=REGULAR), REGULAR)
+        self.assertEqual(canonical.restore(solved, cells, labels), solution)
+
+
+class TestSolveCache(unittest.TestCase):
+
+    def test_hits(self):
+        rng = random.Random(1)
+        cache = canonical.SolveCache()
+        grid = benchmark.load_tier('hard')[1]
+        for _ in range(3):
+            puzzle = shuffle(grid, rng)
+            solved = cache.solve_grid(puzzle, REGULAR)
+            self.assertTrue(all(c == '.' or c == s for c, s in zip(puzzle, solved)))
+            self.assertEqual(bitboard.count_solutions(solved, REGULAR), 1)
+        self.assertEqual((cache.hits, cache.misses, len(cache)), (2, 1, 1))
+        values = cache.solve(grid, REGULAR)
+        self.assertEqual(len(values), 81)
+        self.assertRaises(ValueError, cache.solve_grid, grid[:80], REGULAR)
+
+    def test_exact_hit(self):
+        cache = canonical.SolveCache()
+        grid = benchmark.load_tier('easy')[0]
+        solved = cache.solve_grid(grid, REGULAR)
+        # a puzzle seen before is answered without computing its canonical form
+        self.addCleanup(setattr, canonical, 'canonical_form', canonical.canonical_form)
+        canonical.canonical_form = None
+        self.assertEqual(cache.solve_grid(grid, REGULAR), solved)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+    def test_no_solution(self):
+        cache = canonical.SolveCache()
+        self.assertFalse(cache.solve_grid('11' + '.' * 79, REGULAR))
+        self.assertFalse(cache.solve('11' + '.' * 79, REGULAR))
+        self.assertEqual(cache.hits, 1)
+
+    def test_eviction(self):
+        cache = canonical.SolveCache(maxsize=2)
+        grids = benchmark.load_tier('hard')[:3]
+        for grid in grids:
+            cache.solve_grid(grid, REGULAR)
+        self.assertEqual(len(cache), 2)
+        cache.solve_grid(grids[0], REGULAR)
+        self.assertEqual(cache.misses, 4)
+
+    def test_shelf(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        path = os.path.join(directory, 'solutions')
+        grid = benchmark.load_tier('hard')[2]
+        with canonical.SolveCache(path=path) as cache:
+            solved = cache.solve_grid(grid, REGULAR)
+        with canonical.SolveCache(path=path) as cache:
+            self.assertEqual(cache.solve_grid(grid, REGULAR), solved)
+            self.assertEqual((cache.hits, cache.misses), (1, 0))
+
+
+if __name__ == '__main__':
+    unittest.main()
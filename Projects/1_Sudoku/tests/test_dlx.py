@@ -0,0 +1,49 @@
+import unittest
+
+import dlx
+import solution
+from tests import test_solution
+from topology import REGULAR, regular_topology
+
+
+class TestDancingLinks(unittest.TestCase):
+
+    def test_exact_cover(self):
+        # Knuth's example from the Dancing Links paper
+        matrix = dlx.DancingLinks(7)
+        rows = {'A': [2, 4, 5], 'B': [0, 3, 6], 'C': [1, 2, 5], 'D': [0, 3],
+                'E': [1, 6], 'F': [3, 4, 6]}
+        for row, columns in sorted(rows.items()):
+            matrix.add_row(row, columns)
+        self.assertEqual([sorted(s) for s in matrix.solutions()], [['A', 'D', 'E']])
+
+    def test_no_cover(self):
+        matrix = dlx.DancingLinks(2)
+        matrix.add_row('A', [0])
+        self.assertEqual(list(matrix.solutions()), [])
+
+
+class TestDlxSolver(unittest.TestCase):
+    diagonal_grid = test_solution.TestDiagonalSudoku.diagonal_grid
+    solved_diag_sudoku = test_solution.TestDiagonalSudoku.solved_diag_sudoku
+    hard_grid = '8..........36......7..9.2...5...7.......457.....1...3...1....68..85...1..9....4..'
+
+    def test_solve(self):
+        self.assertEqual(dlx.solve(self.diagonal_grid), self.solved_diag_sudoku)
+        self.assertFalse(dlx.solve('11' + '.' * 79))
+
+    def test_solution_methods(self):
+        expected = solution.solve(self.hard_grid, REGULAR)
+        for method in ('bitboard', 'dlx'):
+            self.assertEqual(solution.solve(self.hard_grid, REGULAR, method), expected, method)
+        self.assertRaises(ValueError, solution.solve, self.hard_grid, REGULAR, 'guess')
+
+    def test_count_solutions(self):
+        self.assertEqual(dlx.count_solutions(self.hard_grid, REGULAR), 1)
+        self.assertEqual(dlx.count_solutions('11' + '.' * 79), 0)
+        self.assertEqual(dlx.count_solutions('.' * 16, regular_topology(2)), 288)
+        self.assertEqual(dlx.count_solutions('.' * 81, REGULAR, limit=10), 10)
+
+
+if __name__ == '__main__':
+    unittest.main()
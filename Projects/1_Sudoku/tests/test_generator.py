@@ -0,0 +1,47 @@
+import random
+import unittest
+
+import bitboard
+import generator
+from topology import REGULAR, regular_topology
+
+
+class TestGenerator(unittest.TestCase):
+
+    def test_random_solution(self):
+        for topology in (REGULAR, generator.DIAGONAL, regular_topology(2)):
+            board = generator.random_solution(topology, random.Random(1))
+            grid = bitboard.board2grid(board, topology)
+            self.assertNotIn('.', grid)
+            self.assertEqual(bitboard.count_solutions(grid, topology), 1)
+
+    def test_generate_unique(self):
+        puzzle = generator.generate(REGULAR, seed=3)
+        self.assertEqual(bitboard.count_solutions(puzzle, REGULAR), 1)
+        self.assertEqual(puzzle, generator.generate(REGULAR, seed=3))
+
+    def test_target_clues(self):
+        puzzle = generator.generate(REGULAR, clues=32, seed=4)
+        self.assertEqual(sum(c != '.' for c in puzzle), 32)
+        self.assertEqual(bitboard.count_solutions(puzzle, REGULAR), 1)
+        self.assertIsNone(generator.generate(regular_topology(2), clues=1, seed=4, attempts=2))
+
+    def test_difficulty(self):
+        easy = generator.generate(REGULAR, clues=28, difficulty='easy', seed=5)
+        self.assertTrue(generator.is_easy(easy, REGULAR))
+        hard = generator.generate(REGULAR, difficulty='hard', seed=5)
+        self.assertFalse(generator.is_easy(hard, REGULAR))
+        self.assertRaises(ValueError, generator.generate, REGULAR, difficulty='fiendish')
+
+    def test_generate_many(self):
+        expected = [generator.generate(REGULAR, seed=k) for k in range(10, 14)]
+        for workers in (1, 2):
+            stats = generator.BatchStats()
+            puzzles = list(generator.generate_many(4, REGULAR, seed=10, workers=workers,
+                                                   chunksize=1, stats=stats))
+            self.assertEqual(puzzles, expected)
+            self.assertEqual(stats.puzzles, 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,90 @@
+import unittest
+
+import benchmark
+import bitboard
+import ordering
+from topology import REGULAR
+
+
+def digit(d):
+    return 1 << (int(d) - 1)
+
+
+class TestOrderings(unittest.TestCase):
+
+    def setUp(self):
+        self.board = bitboard.grid2board('.' * 81, REGULAR)
+        self.index = REGULAR.index
+
+    def test_mrv(self):
+        self.board[self.index['E5']] = digit(1) | digit(2)
+        self.board[self.index['I9']] = digit(3) | digit(4)
+        unsolved = range(81)
+        self.assertEqual(ordering.mrv(self.board, unsolved, REGULAR), self.index['E5'])
+
+    def test_mrv_degree(self):
+        self.board[self.index['A1']] = digit(1) | digit(2)
+        self.board[self.index['E5']] = digit(3) | digit(4)
+        # solve most of A1's row, so E5 has more unsolved peers
+        for c, d in zip('23456789', '3456789'):
+            self.board[self.index['A' + c]] = digit(d)
+        unsolved = [i for i, m in enumerate(self.board) if m & (m - 1)]
+        self.assertEqual(ordering.mrv(self.board, unsolved, REGULAR), self.index['A1'])
+        self.assertEqual(ordering.mrv_degree(self.board, unsolved, REGULAR), self.index['E5'])
+
+    def test_value_orderings(self):
+        i = self.index['A1']
+        self.board[i] = digit(1) | digit(2) | digit(3)
+        for box in ('A2', 'A3', 'B1'):
+            self.board[self.index[box]] &= ~digit(2)
+        # digit 3 has the fewest places on the board, but none outside A1's peers
+        for box in ('E5', 'E6', 'E7', 'F5', 'F6', 'F7'):
+            self.board[self.index[box]] &= ~digit(3)
+        self.assertEqual(ordering.ascending(self.board, i, REGULAR), [digit(1), digit(2), digit(3)])
+        self.assertEqual(ordering.least_constraining(self.board, i, REGULAR)[0], digit(2))
+        self.assertEqual(ordering.frequency(self.board, i, REGULAR)[0], digit(3))
+
+    def test_tally_advance(self):
+        grid = benchmark.load_tier('hard')[0]
+        board = bitboard.reduce_puzzle(bitboard.grid2board(grid, REGULAR), REGULAR)
+        tally = ordering.Tally(board, REGULAR)
+        places, unsolved_peers = tally.places[:], tally.unsolved_peers[:]
+        trail = []
+        i = ordering.mrv(board, range(81), REGULAR)
+        trail.append((i, board[i]))
+        board[i] &= -board[i]
+        self.assertIsNot(bitboard.propagate(board, (i,), trail, REGULAR), False)
+        fresh = ordering.Tally(board, REGULAR)
+        advanced = tally.advance(board, trail, REGULAR)
+        self.assertEqual(advanced.places, fresh.places)
+        self.assertEqual(advanced.unsolved_peers, fresh.unsolved_peers)
+        # the parent tally is left as it was, for backtracking
+        self.assertEqual((tally.places, tally.unsolved_peers), (places, unsolved_peers))
+
+
+class TestSearchOrderings(unittest.TestCase):
+
+    def test_orderings_solve_the_corpus(self):
+        grids = benchmark.load_tier('hard')[:10]
+        expected = [bitboard.search(bitboard.grid2board(g, REGULAR), topology=REGULAR)
+                    for g in grids]
+        for variable in ordering.VARIABLE_ORDERINGS:
+            for value in ordering.VALUE_ORDERINGS:
+                for grid, solved in zip(grids, expected):
+                    board = bitboard.search(bitboard.grid2board(grid, REGULAR), inplace=True,
+                                            topology=REGULAR, variable=variable, value=value)
+                    self.assertEqual(board, solved, (variable, value))
+                    board = bitboard.search(bitboard.grid2board(grid, REGULAR), topology=REGULAR,
+                                            variable=variable, value=value)
+                    self.assertEqual(board, solved, (variable, value))
+                    self.assertEqual(bitboard.count_solutions(grid, REGULAR, variable=variable,
+                                                              value=value), 1)
+
+    def test_unknown_ordering(self):
+        board = bitboard.grid2board('.' * 81, REGULAR)
+        self.assertRaises(ValueError, bitboard.search, board, topology=REGULAR, variable='guess')
+        self.assertRaises(ValueError, bitboard.search, board, topology=REGULAR, value='guess')
+
+
+if __name__ == '__main__':
+    unittest.main()
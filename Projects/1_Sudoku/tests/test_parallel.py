@@ -0,0 +1,50 @@
+import unittest
+
+import benchmark
+import bitboard
+import parallel
+from tests import test_solution
+from topology import REGULAR
+
+
+class TestSplit(unittest.TestCase):
+
+    def test_split_covers_the_search_tree(self):
+        board = bitboard.grid2board('.' * 81, REGULAR)
+        subproblems = parallel.split(board, REGULAR, count=8)
+        self.assertGreaterEqual(len(subproblems), 8)
+        # every subproblem is a distinct branch below the original board
+        self.assertEqual(len({tuple(b) for b in subproblems}), len(subproblems))
+        for b in subproblems:
+            self.assertTrue(all(m & o == m for m, o in zip(b, board)))
+
+    def test_split_solved_board(self):
+        grid = benchmark.load_tier('easy')[0]
+        board = bitboard.reduce_puzzle(bitboard.grid2board(grid, REGULAR), REGULAR)
+        self.assertEqual(parallel.split(board, REGULAR, count=8), [board])
+
+
+class TestParallelSearch(unittest.TestCase):
+
+    def test_matches_sequential_search(self):
+        grid = benchmark.load_tier('hard')[0]
+        expected = bitboard.search(bitboard.grid2board(grid, REGULAR), topology=REGULAR)
+        for workers in (1, 2):
+            board = parallel.parallel_search(bitboard.grid2board(grid, REGULAR), REGULAR,
+                                             workers=workers)
+            self.assertEqual(board, expected)
+
+    def test_first_solution_of_many(self):
+        board = parallel.parallel_search(bitboard.grid2board('.' * 81, REGULAR), REGULAR,
+                                         workers=2)
+        self.assertTrue(all(m and not m & (m - 1) for m in board))
+        self.assertEqual(bitboard.count_solutions(bitboard.board2grid(board, REGULAR), REGULAR), 1)
+
+    def test_solve(self):
+        self.assertEqual(parallel.solve(test_solution.TestDiagonalSudoku.diagonal_grid, workers=2),
+                         test_solution.TestDiagonalSudoku.solved_diag_sudoku)
+        self.assertFalse(parallel.solve('11' + '.' * 79, workers=2))
+
+
+if __name__ == '__main__':
+    unittest.main()
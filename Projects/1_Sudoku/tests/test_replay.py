@@ -0,0 +1,67 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+try:
+    import pygame
+    import replay
+except ImportError:
+    pygame = None
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+from topology import DIAGONAL
+
+
+@unittest.skipIf(pygame is None, 'pygame is not installed')
+class TestReplay(unittest.TestCase):
+    grid = '2.............62....1....7...6..8...3...9...7...6..4...4....8....52.............3'
+
+    def setUp(self):
+        self.values, self.assignments = replay.solve_replay(self.grid, DIAGONAL)
+
+    def test_layout(self):
+        self.assertEqual(replay.square_origin(0, 0), (38, 35))
+        self.assertEqual(replay.square_origin(3, 6), (270, 507))
+
+    def test_frames(self):
+        frames = list(replay.Replay(self.values).frames(self.assignments, steps=4))
+        self.assertEqual(len(frames), 1 + -(-len(self.assignments) // 4))
+        for surface, dirty in frames[1:]:
+            self.assertLessEqual(len(dirty), 4)
+
+    def test_incremental_drawing(self):
+        board = replay.Replay(self.values)
+        for _ in board.frames(self.assignments):
+            pass
+        self.assertEqual(board.apply(*self.assignments[-1]), None)
+        solved = replay.Replay(board.values)
+        self.assertEqual(pygame.image.tostring(board.surface, 'RGB'),
+                         pygame.image.tostring(solved.surface, 'RGB'))
+
+    def test_save_frames(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        frames = replay.Replay(self.values).frames(self.assignments[:3])
+        paths = replay.save_frames(frames, directory, ext='bmp')
+        self.assertEqual(len(paths), 4)
+        self.assertTrue(all(os.path.exists(path) for path in paths))
+
+    @unittest.skipIf(Image is None, 'Pillow is not installed')
+    def test_save_gif(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        board = replay.Replay(self.values)
+        frames = board.frames(self.assignments[:3])
+        path = replay.save_gif(frames, os.path.join(directory, 'replay.gif'))
+        with Image.open(path) as image:
+            self.assertEqual(image.n_frames, 4)
+            self.assertEqual(image.size, board.surface.get_size())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,42 @@
+import io
+import json
+import unittest
+
+import run_solver
+from tests import test_solution
+
+
+class TestRun(unittest.TestCase):
+    diagonal_grid = test_solution.TestDiagonalSudoku.diagonal_grid
+    lines = ['# corpus', diagonal_grid.replace('.', '0'), 'bad', '', '11' + '.' * 79, diagonal_grid]
+
+    def solved(self):
+        values = test_solution.TestDiagonalSudoku.solved_diag_sudoku
+        return ''.join(values[box] for box in run_solver.boxes)
+
+    def test_one_record_per_puzzle(self):
+        out = io.StringIO()
+        failures = run_solver.run(self.lines, out, workers=1)
+        self.assertEqual(failures, 2)
+        self.assertEqual(out.getvalue().splitlines(), [
+            self.solved(),
+            'error: line 3: malformed puzzle: bad',
+            'error: line 5: no solution: ' + self.lines[4],
+            self.solved()])
+
+    def test_skip_errors(self):
+        out = io.StringIO()
+        run_solver.run(self.lines, out, errors='skip', workers=2, chunksize=1)
+        self.assertEqual(out.getvalue().splitlines(), [self.solved()] * 2)
+
+    def test_json(self):
+        out = io.StringIO()
+        run_solver.run(self.lines, out, fmt='json', workers=1)
+        records = [json.loads(line) for line in out.getvalue().splitlines()]
+        self.assertEqual([r['line'] for r in records], [2, 3, 5, 6])
+        self.assertEqual(records[0]['solution'], self.solved())
+        self.assertEqual(records[1]['error'], 'malformed puzzle')
+
+
+if __name__ == '__main__':
+    unittest.main()
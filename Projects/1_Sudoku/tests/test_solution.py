@@ -5,6 +5,7 @@ own additional test cases to cover any failed tests shown in the Project Assista
 """
 import unittest
 import solution
+from utils import History
 
 
 class TestNakedTwins(unittest.TestCase):
@@ -99,5 +100,10 @@ class TestDiagonalSudoku(unittest.TestCase):
     def test_solve(self):
         self.assertEqual(solution.solve(self.diagonal_grid), self.solved_diag_sudoku)
 
+    def test_history_needs_search(self):
+        for method in ('bitboard', 'dlx'):
+            with self.assertRaises(ValueError):
+                solution.solve(self.diagonal_grid, method=method, history=History())
+
 if __name__ == '__main__':
     unittest.main()
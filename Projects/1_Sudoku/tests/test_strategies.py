@@ -0,0 +1,82 @@
+import unittest
+from collections import Counter
+
+import bitboard
+import strategies
+from topology import REGULAR
+
+
+def digit(d):
+    return 1 << (int(d) - 1)
+
+
+class TestStrategies(unittest.TestCase):
+    hard_grid = '8..........36......7..9.2...5...7.......457.....1...3...1....68..85...1..9....4..'
+
+    def setUp(self):
+        self.board = bitboard.grid2board('.' * 81, REGULAR)
+        self.index = REGULAR.index
+
+    def remove(self, mask, boxes):
+        for box in boxes:
+            self.board[self.index[box]] &= ~mask
+
+    def run_strategy(self, strategy):
+        changed = []
+        eliminated = strategy(self.board, REGULAR, None, changed)
+        return eliminated, {REGULAR.boxes[i] for i in changed}
+
+    def test_naked_triples(self):
+        for box, digits in (('A1', '12'), ('A2', '23'), ('A3', '13')):
+            self.board[self.index[box]] = digit(digits[0]) | digit(digits[1])
+        eliminated, changed = self.run_strategy(strategies.naked_triples)
+        self.assertEqual(changed, {'A4', 'A5', 'A6', 'A7', 'A8', 'A9',
+                                   'B1', 'B2', 'B3', 'C1', 'C2', 'C3'})
+        self.assertEqual(eliminated, 3 * len(changed))
+
+    def test_hidden_pairs(self):
+        self.remove(digit(1) | digit(2), ['A3', 'A4', 'A5', 'A6', 'A7', 'A8', 'A9'])
+        eliminated, changed = self.run_strategy(strategies.hidden_pairs)
+        self.assertEqual(changed, {'A1', 'A2'})
+        self.assertEqual(self.board[self.index['A1']], digit(1) | digit(2))
+
+    def test_pointing_pairs(self):
+        self.remove(digit(1), ['A3', 'B1', 'B2', 'B3', 'C1', 'C2', 'C3'])
+        eliminated, changed = self.run_strategy(strategies.pointing_pairs)
+        self.assertEqual(changed, {'A4', 'A5', 'A6', 'A7', 'A8', 'A9'})
+        self.assertEqual(eliminated, 6)
+
+    def test_box_line_reduction(self):
+        self.remove(digit(1), ['A4', 'A5', 'A6', 'A7', 'A8', 'A9'])
+        eliminated, changed = self.run_strategy(strategies.box_line_reduction)
+        self.assertEqual(changed, {'B1', 'B2', 'B3', 'C1', 'C2', 'C3'})
+
+    def test_x_wing(self):
+        self.remove(digit(1), ['A2', 'A3', 'A4', 'A6', 'A7', 'A8', 'A9',
+                               'E2', 'E3', 'E4', 'E6', 'E7', 'E8', 'E9'])
+        eliminated, changed = self.run_strategy(strategies.x_wing)
+        self.assertEqual(changed, {r + c for r in 'BCDFGHI' for c in '15'})
+        self.assertEqual(eliminated, 14)
+
+    def test_strategies_keep_the_solution(self):
+        solution = bitboard.search(bitboard.grid2board(self.hard_grid, REGULAR), topology=REGULAR)
+        for name in strategies.STRATEGIES:
+            board = bitboard.reduce_puzzle(bitboard.grid2board(self.hard_grid, REGULAR), REGULAR,
+                                           strategies=[name])
+            self.assertTrue(all(m & s for m, s in zip(board, solution)), name)
+
+    def test_pipeline_counters(self):
+        counters = Counter()
+        board = bitboard.search(bitboard.grid2board(self.hard_grid, REGULAR), topology=REGULAR,
+                                strategies=list(strategies.STRATEGIES), counters=counters)
+        expected = bitboard.search(bitboard.grid2board(self.hard_grid, REGULAR), topology=REGULAR)
+        self.assertEqual(board, expected)
+        self.assertGreater(counters['eliminate'], 0)
+        self.assertGreater(counters['hidden_pairs'], 0)
+
+    def test_unknown_strategy(self):
+        self.assertRaises(ValueError, bitboard.reduce_puzzle, self.board, REGULAR, ['guess'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,48 @@
+import pickle
+import unittest
+
+import bitboard
+import solution
+import topology
+from utils import boxes, extract_peers, extract_units
+
+
+class TestTopology(unittest.TestCase):
+    regular_grid = '..3.2.6..9..3.5..1..18.64....81.29..7.......8..67.82....26.95..8..2.3..9..5.1.3..'
+
+    def test_cached_by_unit_definition(self):
+        unitlist = [list(unit) for unit in topology.REGULAR.unitlist]
+        self.assertIs(topology.get_topology(unitlist), topology.REGULAR)
+        self.assertIs(solution.diagonal_topology, topology.DIAGONAL)
+
+    def test_pickle_returns_cached_instance(self):
+        self.assertIs(pickle.loads(pickle.dumps(topology.DIAGONAL)), topology.DIAGONAL)
+
+    def test_tables_match_utils(self):
+        for top in (topology.REGULAR, topology.DIAGONAL):
+            units = extract_units(top.unitlist, boxes)
+            peers = extract_peers(units, boxes)
+            for box in boxes:
+                self.assertEqual(list(top.units[box]), units[box])
+                self.assertEqual(top.peers[box], peers[box])
+                self.assertEqual(sorted(boxes[p] for p in top.cell_peers[top.index[box]]),
+                                 sorted(peers[box]))
+
+    def test_immutable(self):
+        with self.assertRaises(TypeError):
+            topology.REGULAR.peers['A1'] = frozenset()
+        with self.assertRaises(AttributeError):
+            topology.REGULAR.extra = None
+
+    def test_solve_both_variants(self):
+        self.assertEqual(len(topology.REGULAR.peers['A1']), 20)
+        self.assertEqual(len(topology.DIAGONAL.peers['A1']), 26)
+        expected = solution.solve(self.regular_grid, topology.REGULAR)
+        self.assertTrue(expected)
+        self.assertEqual(bitboard.solve(self.regular_grid, topology.REGULAR), expected)
+        # the diagonal variant is unaffected by solving the regular one
+        self.assertEqual(len(solution.unitlist), 29)
+
+
+if __name__ == '__main__':
+    unittest.main()
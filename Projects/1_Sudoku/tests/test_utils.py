@@ -0,0 +1,42 @@
+import unittest
+
+import solution
+import utils
+from tests import test_solution
+
+
+class TestHistory(unittest.TestCase):
+    diagonal_grid = test_solution.TestDiagonalSudoku.diagonal_grid
+
+    def test_assign_value_without_history(self):
+        values = utils.grid2values(self.diagonal_grid)
+        utils.assign_value(values, 'A2', '5')
+        self.assertEqual(values['A2'], '5')
+        self.assertFalse(hasattr(utils, 'history'))
+
+    def test_assign_value_records_solved_boxes(self):
+        history = utils.History()
+        values = utils.grid2values(self.diagonal_grid)
+        utils.assign_value(values, 'A2', '45', history)
+        self.assertEqual(len(history), 0)
+        utils.assign_value(values, 'A2', '5', history)
+        self.assertEqual(utils.reconstruct(values, history), [('A2', '5')])
+
+    def test_replay_solution(self):
+        history = utils.History()
+        result = solution.solve(self.diagonal_grid, history=history)
+        values = utils.grid2values(self.diagonal_grid)
+        for box, value in utils.reconstruct(result, history):
+            values[box] = value
+        self.assertEqual(values, result)
+
+    def test_ring_buffer(self):
+        history = utils.History(maxlen=10)
+        result = solution.solve(self.diagonal_grid, history=history)
+        self.assertEqual(len(history), 10)
+        self.assertEqual(len(utils.reconstruct(result, history)), 10)
+        self.assertRaises(ValueError, utils.History, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+import unittest
+
+import batch
+import benchmark
+import vectorized
+from batch import BatchStats
+from topology import DIAGONAL, REGULAR
+
+
+class TestTensor(unittest.TestCase):
+
+    def test_round_trip(self):
+        grids = benchmark.load_tier('hard')[:5]
+        candidates = vectorized.grids2tensor(grids, REGULAR)
+        self.assertEqual(candidates.shape, (5, 81, 9))
+        self.assertEqual(vectorized.tensor2grids(candidates, REGULAR), grids)
+
+    def test_bad_grids(self):
+        self.assertRaises(ValueError, vectorized.grids2tensor, ['.' * 80], REGULAR)
+        self.assertRaises(ValueError, vectorized.grids2tensor, ['0' + '.' * 80], REGULAR)
+
+
+class TestPropagate(unittest.TestCase):
+
+    def test_easy(self):
+        grids = benchmark.load_tier('easy')
+        candidates, invalid = vectorized.propagate(vectorized.grids2tensor(grids, REGULAR),
+                                                   REGULAR)
+        self.assertFalse(invalid.any())
+        self.assertTrue((candidates.sum(2) == 1).all())
+
+    def test_contradictions(self):
+        grids = ['11' + '.' * 79, '.' * 81, '1' + '.' * 8 + '.1' + '.' * 70]
+        candidates, invalid = vectorized.propagate(vectorized.grids2tensor(grids, REGULAR),
+                                                   REGULAR)
+        self.assertEqual(invalid.tolist(), [True, False, True])
+
+
+class TestSolve(unittest.TestCase):
+
+    def test_matches_bitboard(self):
+        for tier, topology in (('easy', REGULAR), ('hard', REGULAR), ('diagonal', DIAGONAL)):
+            grids = benchmark.load_tier(tier)[:20]
+            expected = [batch.solve_grid(grid, topology) for grid in grids]
+            self.assertEqual(vectorized.solve_chunk(grids, topology), expected, tier)
+
+    def test_solve_many(self):
+        grids = benchmark.load_tier('easy')[:10] + ['11' + '.' * 79]
+        stats = BatchStats()
+        results = list(vectorized.solve_many(grids, REGULAR, chunksize=3, stats=stats))
+        self.assertEqual(results, vectorized.solve_chunk(grids, REGULAR))
+        self.assertFalse(results[-1])
+        self.assertEqual((stats.puzzles, stats.failed), (11, 1))
+        self.assertEqual(vectorized.solve_chunk([], REGULAR), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,183 @@
+"""Precomputed unit and peer tables for Sudoku variants
+
+A `Topology` holds everything that depends only on the shape of a puzzle: the
+boxes, the units (rows, columns, squares, diagonals, ...), the member units and
+peers of every box, and the same tables as slot indices for the bitmask engine.
+
+Topologies are immutable and cached by their unit definition, so each variant
+is derived once per process. Pass them to the solvers to solve different
+variants side by side instead of changing a module-level unit list.
+`regular_topology` builds the standard and diagonal variants for any board of
+N x N boxes with N = box_size ** 2 (4x4, 9x9, 16x16 and 25x25). `VARIANTS`
+maps the names of the 9x9 variants to their topologies.
+"""
+from functools import lru_cache
+from types import MappingProxyType
+
+from utils import boxes, cols, cross, rows
+
+
+ROW_NAMES = 'ABCDEFGHIJKLMNOPQRSTUVWXY'
+DIGITS = '123456789ABCDEFGHIJKLMNOP'
+
+row_units = [cross(r, cols) for r in rows]
+column_units = [cross(rows, c) for c in cols]
+square_units = [cross(rs, cs) for rs in ('ABC', 'DEF', 'GHI')
+                for cs in ('123', '456', '789')]
+diagonal_units = [[r + c for r, c in zip(rows, cols)],
+                  [r + c for r, c in zip(rows, cols[::-1])]]
+
+
+class Topology:
+    """The units and peers of a Sudoku variant
+
+    Use `get_topology` (or the REGULAR and DIAGONAL constants) rather than
+    creating instances directly, so that the tables are shared.
+
+    Attributes
+    ----------
+    boxes(tuple)
+        the box names in board order, e.g. ('A1', 'A2', ...)
+
+    unitlist(tuple)
+        every unit as a tuple of box names
+
+    units(mapping)
+        a read-only mapping from each box to the tuple of units it belongs to
+
+    peers(mapping)
+        a read-only mapping from each box to the frozenset of its peers
+
+    digits(str)
+        the symbols that fill every unit, one per candidate bit on a board
+
+    index(mapping)
+        a read-only mapping from each box to its slot on a board
+
+    unit_kinds(tuple)
+        for each unit, 'row', 'column', 'square' or 'other' (e.g. diagonals),
+        inferred from the row letter and column number in the box names
+
+    unit_cells(tuple)
+        every unit as a tuple of slot indices, in unitlist order
+
+    cell_units(tuple)
+        for each slot, the indices (into unit_cells) of its units
+
+    cell_peers(tuple)
+        for each slot, the sorted slot indices of its peers
+    """
+    __slots__ = ('boxes', 'unitlist', 'units', 'peers', 'digits', 'index',
+                 'unit_kinds', 'unit_cells', 'cell_units', 'cell_peers')
+
+    def __init__(self, unitlist, boxes, digits):
+        index = {box: i for i, box in enumerate(boxes)}
+        unit_cells = tuple(tuple(index[box] for box in unit) for unit in unitlist)
+
+        cell_units = [[] for _ in boxes]
+        for u, unit in enumerate(unit_cells):
+            for i in unit:
+                cell_units[i].append(u)
+        cell_peers = [sorted({p for u in us for p in unit_cells[u]} - {i})
+                      for i, us in enumerate(cell_units)]
+
+        self.boxes = boxes
+        self.unitlist = unitlist
+        self.digits = digits
+        self.index = MappingProxyType(index)
+        self.unit_kinds = tuple(_unit_kind(unit) for unit in unitlist)
+        self.units = MappingProxyType({box: tuple(unitlist[u] for u in cell_units[i])
+                                       for i, box in enumerate(boxes)})
+        self.peers = MappingProxyType({box: frozenset(boxes[p] for p in cell_peers[i])
+                                       for i, box in enumerate(boxes)})
+        self.unit_cells = unit_cells
+        self.cell_units = tuple(map(tuple, cell_units))
+        self.cell_peers = tuple(map(tuple, cell_peers))
+
+    def __reduce__(self):
+        # rebuild through the cache so that worker processes share the tables too
+        return get_topology, (self.unitlist, self.boxes, self.digits)
+
+    def __repr__(self):
+        return '<Topology: {} boxes, {} units, digits {!r}>'.format(
+            len(self.boxes), len(self.unitlist), self.digits)
+
+
+def _unit_kind(unit):
+    unit_rows = {box[0] for box in unit}
+    unit_cols = {box[1:] for box in unit}
+    if len(unit_rows) == 1:
+        return 'row'
+    if len(unit_cols) == 1:
+        return 'column'
+    if len(unit_rows) == len(unit_cols) and len(unit_rows) * len(unit_cols) == len(unit):
+        return 'square'
+    return 'other'
+
+
+def get_topology(unitlist, boxes=boxes, digits=DIGITS[:9]):
+    """Return the topology for a list of units, computing it only once
+
+    Parameters
+    ----------
+    unitlist(list)
+        a list containing "units" (rows, columns, diagonals, etc.) of boxes
+
+    boxes(list)
+        a list of strings identifying each box on a sudoku board in board order
+
+    digits(str)
+        the symbols that fill every unit; each unit must have len(digits) boxes
+
+    Returns
+    -------
+    Topology
+        the shared topology for this unit definition
+    """
+    return _cached_topology(tuple(map(tuple, unitlist)), tuple(boxes), digits)
+
+
+@lru_cache(maxsize=None)
+def _cached_topology(unitlist, boxes, digits):
+    return Topology(unitlist, boxes, digits)
+
+
+def regular_topology(box_size=3, diagonal=False):
+    """Return the topology of a board with N x N boxes, where N = box_size ** 2
+
+    Rows are named with letters and columns with numbers ('A1' ... 'P16' on a
+    16x16 board), and the digits are '1'-'9' followed by letters, e.g.
+    '123456789ABCDEFG' for a 16x16 board.
+
+    Parameters
+    ----------
+    box_size(int)
+        the side of the square units, from 2 (4x4 boards) to 5 (25x25 boards)
+
+    diagonal(bool)
+        if True, the two main diagonals are units as well
+
+    Returns
+    -------
+    Topology
+        the shared topology for this board size and variant
+    """
+    n = box_size ** 2
+    if not 2 <= box_size <= 5:
+        raise ValueError('box_size must be between 2 and 5, got {}'.format(box_size))
+    rs = ROW_NAMES[:n]
+    cs = [str(c) for c in range(1, n + 1)]
+    unitlist = [cross(r, cs) for r in rs]
+    unitlist += [cross(rs, [c]) for c in cs]
+    unitlist += [cross(rs[i:i + box_size], cs[j:j + box_size])
+                 for i in range(0, n, box_size) for j in range(0, n, box_size)]
+    if diagonal:
+        unitlist += [[r + c for r, c in zip(rs, cs)], [r + c for r, c in zip(rs, cs[::-1])]]
+    return get_topology(unitlist, cross(rs, cs), DIGITS[:n])
+
+
+REGULAR = get_topology(row_units + column_units + square_units)
+DIAGONAL = get_topology(row_units + column_units + square_units + diagonal_units)
+
+# the 9x9 variants by name, as chosen on the command line
+VARIANTS = {'diagonal': DIAGONAL, 'regular': REGULAR}
@@ -1,11 +1,10 @@
 
-from collections import defaultdict
+from collections import OrderedDict, defaultdict
 
 
 rows = 'ABCDEFGHI'
 cols = '123456789'
 boxes = [r + c for r in rows for c in cols]
-history = {}  # history must be declared here so that it exists in the assign_values scope
 
 
 def extract_units(unitlist, boxes):
@@ -27,9 +26,11 @@ def extract_units(unitlist, boxes):
     """
     # the value for keys that aren't in the dictionary are initialized as an empty list
     units = defaultdict(list)
-    for current_box in boxes:
-        for unit in unitlist:
-            if current_box in unit:
+    # a single pass over the units instead of testing every box against every unit
+    box_set = set(boxes)
+    for unit in unitlist:
+        for current_box in unit:
+            if current_box in box_set:
                 # defaultdict avoids this raising a KeyError when new keys are added
                 units[current_box].append(unit)
     return units
@@ -66,21 +67,79 @@ def extract_peers(units, boxes):
     return peers
 
 
-def assign_value(values, box, value):
+class History:
+    """A record of value assignments for `reconstruct` and the visualization
+
+    Nothing is recorded unless a History is passed to `assign_value` (or to
+    `solution.solve`), so solving without one pays no bookkeeping cost. Each
+    assignment maps the grid after it to (grid before, (box, value)), which is
+    the linked list that `reconstruct` walks back from the solution.
+
+    Parameters
+    ----------
+    maxlen(int)
+        if given, only the most recent `maxlen` assignments are kept (a ring
+        buffer), and `reconstruct` returns only the steps still recorded
+    """
+
+    def __init__(self, maxlen=None):
+        if maxlen is not None and maxlen < 1:
+            raise ValueError('maxlen must be at least 1, got {}'.format(maxlen))
+        self.maxlen = maxlen
+        self._steps = OrderedDict()
+
+    def record(self, prev, grid, step):
+        """Record that `step` = (box, value) turned grid `prev` into `grid`"""
+        steps = self._steps
+        steps[grid] = (prev, step)
+        steps.move_to_end(grid)
+        if self.maxlen is not None and len(steps) > self.maxlen:
+            steps.popitem(last=False)
+
+    def clear(self):
+        self._steps.clear()
+
+    def __contains__(self, grid):
+        return grid in self._steps
+
+    def __getitem__(self, grid):
+        return self._steps[grid]
+
+    def __len__(self):
+        return len(self._steps)
+
+    def __repr__(self):
+        return '<History: {} steps, maxlen {}>'.format(len(self._steps), self.maxlen)
+
+
+def assign_value(values, box, value, history=None):
     """You must use this function to update your values dictionary if you want to
     try using the provided visualization tool. This function records each assignment
-    (in order) for later reconstruction.
+    (in order) for later reconstruction when a history is given.
 
     Parameters
     ----------
     values(dict)
         a dictionary of the form {'box_name': '123456789', ...}
 
+    box(string)
+        the box to update
+
+    value(string)
+        the new digits of the box
+
+    history(History)
+        if given, the assignment is recorded in it when it solves the box
+
     Returns
     -------
     dict
-        The values dictionary with the naked twins eliminated from peers
+        The values dictionary with the new value assigned to the box
     """
+    if history is None:
+        values[box] = value
+        return values
+
     # Don't waste memory appending actions that don't actually change any values
     if values[box] == value:
         return values
@@ -88,7 +147,7 @@ def assign_value(values, box, value):
     prev = values2grid(values)
     values[box] = value
     if len(value) == 1:
-        history[values2grid(values)] = (prev, (box, value))
+        history.record(prev, values2grid(values), (box, value))
     return values
 
 def cross(A, B):
@@ -168,8 +227,8 @@ def reconstruct(values, history):
     values(dict)
         a dictionary of the form {'box_name': '123456789', ...}
 
-    history(dict)
-        a dictionary of the form {key: (key, (box, value))} encoding a linked
+    history(History or dict)
+        a mapping of the form {key: (key, (box, value))} encoding a linked
         list where each element points to the parent and identifies the value
         assignment that connects from the parent to the current state
 
@@ -0,0 +1,220 @@
+"""Constraint propagation on many boards at once with NumPy
+
+The candidates of a chunk of puzzles are held in one boolean tensor of shape
+(boards, N * N boxes, N digits), and eliminate and only choice are applied to
+every board at once with matrix products against the unit membership of the
+topology:
+
+* eliminate removes the digits of the solved peers of each box (the peer
+  matrix times the solved boxes)
+* only choice counts the places left for each digit in each unit (the unit
+  matrix times the candidates), and assigns each digit with a single place
+
+Rounds repeat on the boards that changed in the last round until none does.
+Easy puzzles are solved by propagation alone; the boards that stall are
+handed to the bitmask search one at a time. Propagation catches
+contradictions too (a box without candidates, a digit without a place in
+some unit, or two digits that must both go in the same box), so unsolvable
+puzzles are usually rejected without search.
+
+    for solved in vectorized.solve_many(grids, topology=REGULAR):
+        ...
+"""
+from functools import lru_cache
+from itertools import islice
+
+import numpy as np
+
+import bitboard
+from topology import DIAGONAL
+
+
+@lru_cache(maxsize=8)
+def _matrices(topology):
+    """The (units x boxes) unit membership and (boxes x boxes) peer matrices"""
+    n = len(topology.boxes)
+    units = np.zeros((len(topology.unit_cells), n), dtype=np.float32)
+    for u, cells in enumerate(topology.unit_cells):
+        units[u, list(cells)] = 1
+    peers = np.zeros((n, n), dtype=np.float32)
+    for i, cells in enumerate(topology.cell_peers):
+        peers[i, list(cells)] = 1
+    return units, peers
+
+
+@lru_cache(maxsize=8)
+def _digit_table(digits):
+    """Map every byte to the index of its digit, -1 for '.' and N for others"""
+    table = np.full(256, len(digits), dtype=np.int16)
+    table[ord('.')] = -1
+    for k, d in enumerate(digits):
+        table[ord(d)] = k
+    return table
+
+
+def grids2tensor(grids, topology=DIAGONAL):
+    """Convert grid strings into a tensor of candidates
+
+    Parameters
+    ----------
+    grids(sequence)
+        grid strings with '.' for empty boxes
+
+    topology(Topology)
+        the units, peers and digits of the variant
+
+    Returns
+    -------
+    numpy.ndarray
+        a boolean array of shape (boards, N * N, N), True where a digit is
+        still a candidate for a box
+    """
+    size, n = len(topology.boxes), len(topology.digits)
+    for grid in grids:
+        if len(grid) != size:
+            raise ValueError('expected a grid of {} boxes, got {!r}'.format(size, grid))
+    text = ''.join(grids).encode('ascii', 'replace')
+    index = _digit_table(topology.digits)[np.frombuffer(text, dtype=np.uint8)]
+    if (index == n).any():
+        bad = next(g for g in grids if any(c != '.' and c not in topology.digits for c in g))
+        raise ValueError('unexpected characters in grid {!r}'.format(bad))
+    index = index.reshape(len(grids), size)
+    digits = np.arange(n)
+    return (index[..., None] == digits) | (index[..., None] < 0)
+
+
+def tensor2grids(candidates, topology=DIAGONAL):
+    """Convert a tensor of candidates into grid strings with '.' for unsolved boxes"""
+    alphabet = np.frombuffer(('.' + topology.digits).encode('ascii'), dtype=np.uint8)
+    solved = candidates.sum(2) == 1
+    chars = alphabet[np.where(solved, candidates.argmax(2) + 1, 0)]
+    size = len(topology.boxes)
+    return [row.tobytes().decode('ascii') for row in chars.reshape(-1, size)]
+
+
+def propagate(candidates, topology=DIAGONAL):
+    """Apply eliminate and only choice to every board until none changes
+
+    Parameters
+    ----------
+    candidates(numpy.ndarray)
+        a boolean array of shape (boards, N * N, N), see `grids2tensor`
+
+    topology(Topology)
+        the units and peers of the variant
+
+    Returns
+    -------
+    tuple
+        (candidates, invalid): the reduced candidates and a boolean array that
+        is True for the boards that have no solution
+    """
+    units, peers = _matrices(topology)
+    boards, size, n = candidates.shape
+    # the state is kept as 0/1 floats laid out (boxes, digits, boards): each
+    # step is one (rows x boxes) @ (boxes x digits * boards) product, and sums
+    # over the digits of a box add up whole rows of boards
+    state = np.ascontiguousarray(candidates.transpose(1, 2, 0), dtype=np.float32)
+    invalid = np.zeros(boards, dtype=bool)
+    totals = state.sum(axis=(0, 1))
+    active = np.arange(boards)
+    while active.size:
+        x = state if active.size == boards else state[:, :, active]
+        counts = x.sum(1, keepdims=True)
+
+        solved = (x * (counts == 1)).reshape(size, -1)
+        x = x * ((peers @ solved) == 0).reshape(x.shape)
+
+        places = units @ x.reshape(size, -1)
+        single = units.T @ (places == 1).astype(np.float32)
+        hidden = x * (single > 0).reshape(x.shape)
+        forced = hidden.sum(1, keepdims=True)
+        x = hidden + x * (forced == 0)
+
+        counts = x.sum(1)
+        bad = ((places == 0).any(0).reshape(n, -1).any(0) |
+               (forced > 1).any(axis=(0, 1)) | (counts == 0).any(0))
+        invalid[active[bad]] = True
+        # propagation only removes candidates, so a board changed if it has
+        # fewer; a solved board has one per box and is done
+        total = counts.sum(0)
+        changed = (total < totals[active]) & (total > size) & ~bad
+        totals[active] = total
+        if active.size == boards:
+            state = x
+        else:
+            state[:, :, active] = x
+        active = active[changed]
+    return state.transpose(2, 0, 1) > 0, invalid
+
+
+def solve_chunk(grids, topology=DIAGONAL, strategies=()):
+    """Solve a list of grids, propagating on all of them at once
+
+    Parameters
+    ----------
+    grids(sequence)
+        grid strings with '.' for empty boxes
+
+    topology(Topology)
+        the units and peers of the variant to solve
+
+    strategies(sequence)
+        names of additional strategies for the boards that need search (see
+        `bitboard.reduce_puzzle`)
+
+    Returns
+    -------
+    list
+        the solved grid string, or False if there is no solution, for each grid
+    """
+    if not grids:
+        return []
+    candidates, invalid = propagate(grids2tensor(grids, topology), topology)
+    counts = candidates.sum(2)
+    done = (counts == 1).all(1)
+    results = tensor2grids(candidates, topology)
+    weights = 1 << np.arange(len(topology.digits), dtype=np.int64)
+    for b in range(len(grids)):
+        if invalid[b]:
+            results[b] = False
+        elif not done[b]:
+            board = (candidates[b] * weights).sum(1).tolist()
+            board = bitboard.search(board, inplace=True, topology=topology,
+                                    strategies=strategies)
+            results[b] = bitboard.board2grid(board, topology) if board else False
+    return results
+
+
+def solve_many(grids, topology=DIAGONAL, strategies=(), chunksize=256, stats=None):
+    """Solve many puzzles a chunk at a time, yielding the results in order
+
+    Parameters
+    ----------
+    grids(iterable)
+        grid strings with '.' for empty boxes
+
+    topology(Topology), strategies(sequence)
+        see `solve_chunk`
+
+    chunksize(int)
+        the number of boards to propagate at once
+
+    stats(BatchStats)
+        if given, updated with throughput statistics as results are yielded
+
+    Returns
+    -------
+    generator
+        the solved grid string (or False if there is no solution) for each input
+        grid, in input order
+    """
+    it = iter(grids)
+    while True:
+        chunk = list(islice(it, chunksize))
+        if not chunk:
+            return
+        for result in solve_chunk(chunk, topology, strategies):
+            if stats is not None:
+                stats.update(result)
+            yield result
@@ -159,3 +159,70 @@ def decode_state(state, fluent_map):
         else:
             fs.neg.append(fluent_map[idx])
     return fs
+
+
+def encode_bits(fs, fluent_map):
+    """ Convert a FluentState into an integer bitset, where bit i is set when
+    the fluent fluent_map[i] is True.
+
+    Testing and updating a bitset takes a few integer operations regardless of
+    the number of fluents, which makes it a much faster state representation
+    for search than a tuple of booleans.
+
+    Parameters
+    ----------
+    fs: FluentState
+        A state object represented as a FluentState
+
+    fluent_map:
+        An ordered sequence of fluents
+
+    Returns
+    -------
+    int with the bits of the fluents in fs.pos set
+    """
+    return fluents_mask(fs.pos, fluent_map)
+
+
+def decode_bits(state, fluent_map):
+    """ Convert an integer bitset into a FluentState (see `encode_bits`)
+
+    Parameters
+    ----------
+    state: int
+        A state represented as a bitset over fluent_map
+
+    fluent_map:
+        An ordered sequence of fluents
+
+    Returns
+    -------
+    FluentState instance containing the fluents from fluent_map whose bits are
+    set in the pos_list, and the others in the neg_list
+    """
+    fs = FluentState(set(), set())
+    for idx, fluent in enumerate(fluent_map):
+        if state >> idx & 1:
+            fs.pos.append(fluent)
+        else:
+            fs.neg.append(fluent)
+    return fs
+
+
+def fluents_mask(fluents, fluent_map):
+    """ Return the bitset with the bits of the given fluents set
+
+    Parameters
+    ----------
+    fluents:
+        An iterable of fluents, each of which must appear in fluent_map
+
+    fluent_map:
+        An ordered sequence of fluents, or a dict mapping each fluent to its index
+    """
+    if not isinstance(fluent_map, dict):
+        fluent_map = {f: idx for idx, f in enumerate(fluent_map)}
+    mask = 0
+    for f in fluents:
+        mask |= 1 << fluent_map[f]
+    return mask
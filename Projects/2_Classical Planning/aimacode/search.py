@@ -8,6 +8,8 @@ from .utils import (
     is_in, memoize, print_table, Stack, FIFOQueue, PriorityQueue, name
 )
 
+import heapq
+import itertools
 import sys
 
 infinity = float('inf')
@@ -76,7 +78,13 @@ class Node:
     the total path_cost (also known as g) to reach the node.  Other functions
     may add an f and h value; see best_first_graph_search and astar_search for
     an explanation of how the f and h values are handled. You will not need to
-    subclass this class."""
+    subclass this class.
+
+    MODIFIED FROM AIMA VERSION
+        - Use __slots__, with slots for the cached f and h values, so that a
+          node takes a fixed few words instead of an instance dict"""
+
+    __slots__ = ('state', 'parent', 'action', 'path_cost', 'depth', 'f', 'h')
 
     def __init__(self, state, parent=None, action=None, path_cost=0):
         "Create a search tree Node, derived from a parent by an action."
@@ -223,7 +231,7 @@ def best_first_graph_search(problem, f):
             elif child in frontier:
                 incumbent = frontier[child]
                 if f(child) < f(incumbent):
-                    # del frontier[incumbent]
+                    del frontier[incumbent]
                     frontier.append(child)
     return None
 
@@ -286,7 +294,7 @@ def recursive_best_first_search(problem, h=None):
     def RBFS(problem, node, flimit):
         if problem.goal_test(node.state):
             return node, 0   # (The second value is immaterial)
-        successors = node.expand(problem)
+        successors = list(node.expand(problem))
         if len(successors) == 0:
             return None, infinity
         for s in successors:
@@ -310,6 +318,386 @@ def recursive_best_first_search(problem, h=None):
     result, bestf = RBFS(problem, node, infinity)
     return result
 
+
+def _on_path(node, state):
+    "Is state the state of node or of one of its ancestors?"
+    while node is not None:
+        if node.state == state:
+            return True
+        node = node.parent
+    return False
+
+
+def ida_star_search(problem, h=None):
+    """Iterative deepening A*: depth-first searches that cut off the nodes
+    whose f = g + h exceeds a bound, starting from h(root) and raising the
+    bound to the least f that was cut off. Memory is linear in the depth of
+    the solution; states are only checked against the current path, so
+    states reached by several paths are searched again."""
+    h = memoize(h or problem.h, 'h')
+
+    def search(node, bound):
+        f = node.path_cost + h(node)
+        if f > bound:
+            return None, f
+        if problem.goal_test(node.state):
+            return node, f
+        least = infinity
+        for child in node.expand(problem):
+            if _on_path(node, child.state):
+                continue
+            result, t = search(child, bound)
+            if result is not None:
+                return result, t
+            least = min(least, t)
+        return None, least
+
+    root = Node(problem.initial)
+    bound = h(root)
+    while True:
+        result, bound = search(root, bound)
+        if result is not None:
+            return result
+        if bound == infinity:
+            return None
+
+
+class _MemoryEntry:
+    "The bookkeeping of sma_star_search for a node in memory"
+    __slots__ = ('node', 'parent', 'children', 'pending', 'forgotten', 'key')
+
+    def __init__(self, node, parent=None):
+        self.node = node
+        self.parent = parent
+        self.children = []
+        self.pending = None     # actions not in memory, None until expanded
+        self.forgotten = {}     # action -> backed up f of a dropped successor
+        self.key = None         # key in the queue, None when not queued
+
+
+def sma_star_search(problem, h=None, max_nodes=20000):
+    """Simplified memory-bounded A* [Russell 1992]: A* that keeps at most
+    max_nodes nodes in memory. Successors are generated one at a time; when
+    memory is full, the leaf with the highest f (the shallowest among ties)
+    is dropped and its f is remembered by its parent, which regenerates it
+    if the rest of its subtree turns out worse. The solution is optimal if
+    max_nodes is larger than the depth of the shallowest optimal solution.
+    Returns None if no solution fits in memory.
+
+    A successor is not generated if its state is on its path or is already
+    in memory by a path at most as costly. The nodes in memory that still
+    have successors to generate are kept in two heaps, one ordered best
+    first and one ordered worst leaf first, with lazy deletion: an entry of
+    a heap is stale once its node has a new key (or none), or, in the worst
+    heap, once its node has children."""
+    h = memoize(h or problem.h, 'h')
+    best, worst = [], []
+    queued = 0
+    memory = {}     # state -> the entry of the node in memory reached the cheapest
+    tie = itertools.count()
+
+    def pending_f(entry):
+        "The least f of the successors of entry still to be generated"
+        if entry.pending is None:
+            return entry.node.f
+        return min(entry.forgotten.get(a, entry.node.f) for a in entry.pending)
+
+    def enqueue(entry):
+        nonlocal queued, best, worst
+        if entry.key is None:
+            queued += 1
+        entry.key = (pending_f(entry), -entry.node.depth, next(tie))
+        heapq.heappush(best, (entry.key, entry))
+        if not entry.children:
+            push_leaf(entry)
+        if len(best) + len(worst) > 4 * queued + 64:
+            # rebuild the heaps without their stale entries
+            best = [(k, e) for k, e in best if k == e.key]
+            worst = [(k, e) for k, e in worst
+                     if e.key is not None and k == _worst_key(e.key) and not e.children]
+            heapq.heapify(best)
+            heapq.heapify(worst)
+
+    def push_leaf(entry):
+        heapq.heappush(worst, (_worst_key(entry.key), entry))
+
+    def dequeue(entry):
+        nonlocal queued
+        if entry.key is not None:
+            entry.key = None
+            queued -= 1
+
+    def remove_child(parent, entry):
+        parent.children.remove(entry)
+        if memory.get(entry.node.state) is entry:
+            del memory[entry.node.state]
+        if not parent.children and parent.key is not None:
+            push_leaf(parent)
+
+    def backup(entry):
+        """Raise the f of entry and its ancestors to the least f of their
+        successors, once the f of every successor is known"""
+        while entry is not None and entry.pending is not None:
+            if any(a not in entry.forgotten for a in entry.pending):
+                return
+            f = min([c.node.f for c in entry.children] +
+                    [entry.forgotten[a] for a in entry.pending], default=infinity)
+            if f == entry.node.f:
+                return
+            entry.node.f = f
+            if entry.pending:
+                enqueue(entry)
+            entry = entry.parent
+
+    def drop_worst_leaf(keep):
+        skipped, dropped = [], False
+        while worst:
+            key, entry = heapq.heappop(worst)
+            if entry.key is None or key != _worst_key(entry.key) or entry.children:
+                continue
+            if entry.parent is None or entry is keep:
+                skipped.append((key, entry))
+                continue
+            parent = entry.parent
+            dequeue(entry)
+            remove_child(parent, entry)
+            parent.pending.append(entry.node.action)
+            parent.forgotten[entry.node.action] = entry.node.f
+            enqueue(parent)
+            backup(parent)
+            dropped = True
+            break
+        for item in skipped:
+            heapq.heappush(worst, item)
+        return dropped
+
+    root = _MemoryEntry(Node(problem.initial))
+    root.node.f = h(root.node)
+    memory[root.node.state] = root
+    enqueue(root)
+    used = 1
+    while best:
+        key, entry = best[0]
+        if key != entry.key:
+            heapq.heappop(best)
+            continue
+        f, _, _ = key
+        node = entry.node
+        if f == infinity:
+            return None
+        if problem.goal_test(node.state):
+            return node
+        if entry.pending is None:
+            entry.pending = list(problem.actions(node.state))
+        child = None
+        while entry.pending and child is None:
+            action = min(entry.pending, key=lambda a: entry.forgotten.get(a, node.f))
+            entry.pending.remove(action)
+            known = entry.forgotten.pop(action, 0)
+            child = node.child_node(problem, action)
+            other = memory.get(child.state)
+            if (other is not None and other.node.path_cost <= child.path_cost or
+                    _on_path(node, child.state)):
+                child = None
+        if child is not None:
+            if child.depth >= max_nodes - 1 and not problem.goal_test(child.state):
+                child.f = infinity
+            else:
+                child.f = max(node.f, child.path_cost + h(child), known)
+            if child.f < infinity and used >= max_nodes:
+                if drop_worst_leaf(entry):
+                    used -= 1
+                else:
+                    child.f = infinity
+            if child.f < infinity:
+                entry.children.append(_MemoryEntry(child, entry))
+                memory[child.state] = entry.children[-1]
+                enqueue(entry.children[-1])
+                used += 1
+        if entry.pending:
+            enqueue(entry)
+        else:
+            dequeue(entry)
+        backup(entry)
+        while not entry.pending and not entry.children and entry.parent is not None:
+            # a dead end: its successors are all on its path, already in memory
+            # by a path as cheap, or out of memory; which can leave its parent
+            # a dead end too
+            parent = entry.parent
+            dequeue(entry)
+            remove_child(parent, entry)
+            backup(parent)
+            used -= 1
+            entry = parent
+    return None
+
+
+def _worst_key(key):
+    "The key in the worst leaf heap of sma_star_search for a key in the best one"
+    f, depth, order = key
+    return (-f, -depth, -order)
+
+
+def bidirectional_breadth_first_search(problem):
+    """Breadth-first search forward from the initial state and backward
+    (by regression) from the goal, one layer at a time on the side with the
+    smaller frontier, until a state of the forward frontier meets a
+    condition of the backward one. Each side only searches to about half
+    the depth of the solution. The plan has the fewest actions.
+
+    The backward search works on conditions, i.e. sets of states, and
+    needs five more methods of the problem: goal_condition() returns the
+    condition of the goal states, subgoals(condition) returns (action,
+    condition) pairs for the actions that can achieve a condition, and
+    satisfies(state, condition) tests a state against a condition;
+    state_features(state) returns the features (e.g. true fluents) of a
+    state and condition_features(condition) the features that every state
+    meeting the condition has. Each condition of the backward frontier is
+    indexed under the two of its features that are rarest in the forward
+    frontier, and a state is only tested against the conditions indexed
+    under pairs of its own features. Meetings are tested as the forward
+    frontier is generated, and once per backward layer for the whole
+    forward frontier."""
+    node = Node(problem.initial)
+    if problem.goal_test(node.state):
+        return node
+    goal = problem.goal_condition()
+    forward = [node]
+    reached = {node.state}
+    backward = [goal]
+    regressed = {goal: None}    # condition -> (action, condition it achieves)
+
+    def meet(node, condition):
+        while regressed[condition] is not None:
+            action, condition = regressed[condition]
+            node = node.child_node(problem, action)
+        return node
+
+    def index(conditions):
+        """Bucket each condition under its two features found in the fewest
+        states of the forward frontier"""
+        counts = {}
+        for node in forward:
+            for feature in problem.state_features(node.state):
+                counts[feature] = counts.get(feature, 0) + 1
+        buckets = {}
+        for condition in conditions:
+            features = sorted(problem.condition_features(condition),
+                              key=lambda f: counts.get(f, 0))[:2]
+            first, second = (features + [None, None])[:2]
+            buckets.setdefault(first, {}).setdefault(second, []).append(condition)
+        return buckets
+
+    def met(state, buckets):
+        "A condition in buckets that state satisfies, or None"
+        satisfies = problem.satisfies
+        features = [None] + list(problem.state_features(state))
+        for first in features:
+            inner = buckets.get(first)
+            if inner:
+                for second in features:
+                    for condition in inner.get(second, ()):
+                        if satisfies(state, condition):
+                            return condition
+        return None
+
+    buckets = index(backward)
+    while forward and backward:
+        if len(forward) <= len(backward):
+            layer = []
+            for node in forward:
+                for child in node.expand(problem):
+                    if child.state not in reached:
+                        reached.add(child.state)
+                        condition = met(child.state, buckets)
+                        if condition is not None:
+                            return meet(child, condition)
+                        layer.append(child)
+            forward = layer
+        else:
+            layer = []
+            for condition in backward:
+                for action, subgoal in problem.subgoals(condition):
+                    if subgoal not in regressed:
+                        regressed[subgoal] = (action, condition)
+                        layer.append(subgoal)
+            backward, buckets = layer, index(layer)
+            for node in forward:
+                condition = met(node.state, buckets)
+                if condition is not None:
+                    return meet(node, condition)
+    return None
+
+
+def _frontier_layers(problem, start, is_target, limit):
+    """Breadth-first search from start that only keeps the last two layers
+    of states. Every state of the current layer remembers its ancestor in an
+    earlier layer, the relay layer, which moves to the current layer each
+    time the depth reaches a power of two, so a state at depth d > 1 has its
+    relay at a depth in [d/2, d). Returns (depth, target state, relay,
+    relay depth) for the first state found that is_target accepts, or None."""
+    if is_target(start):
+        return 0, start, None, 0
+    previous, current = set(), {start: None}
+    depth, relay_depth = 0, 0
+    while current and (limit is None or depth < limit):
+        if depth and depth & (depth - 1) == 0:
+            relay_depth = depth
+        layer = {}
+        for state, relay in current.items():
+            if relay_depth == depth and depth:
+                relay = state
+            for action in problem.actions(state):
+                child = problem.result(state, action)
+                if child in previous or child in current or child in layer:
+                    continue
+                if is_target(child):
+                    return depth + 1, child, relay, relay_depth
+                layer[child] = relay
+        previous, current = set(current), layer
+        depth += 1
+    return None
+
+
+def _frontier_path(problem, start, target, depth):
+    "The list of states of a path of the given depth from start to target"
+    if depth == 0:
+        return [start]
+    if depth == 1:
+        return [start, target]
+    _, _, relay, relay_depth = _frontier_layers(problem, start, lambda s: s == target, depth)
+    return (_frontier_path(problem, start, relay, relay_depth)[:-1] +
+            _frontier_path(problem, relay, target, depth - relay_depth))
+
+
+def frontier_breadth_first_search(problem, limit=None):
+    """Breadth-first frontier search [Korf 2005]: breadth-first search that
+    keeps no list of explored states, only the last two layers of the
+    frontier, so memory grows with the width of the search rather than with
+    the number of states reached. The path is rebuilt by divide and
+    conquer: each state remembers an ancestor about halfway back (see
+    _frontier_layers), and the path is found by searching again from the
+    start to that ancestor and from the ancestor to the goal.
+
+    Actions that cannot be undone may lead back to states older than the
+    last two layers, which are then searched again; limit bounds the length
+    of the plan, which makes the search terminate on such problems when
+    there is no solution."""
+    found = _frontier_layers(problem, problem.initial, problem.goal_test, limit)
+    if found is None:
+        return None
+    depth, goal, relay, relay_depth = found
+    if depth <= 1:
+        states = [problem.initial, goal][:depth + 1]
+    else:
+        states = (_frontier_path(problem, problem.initial, relay, relay_depth)[:-1] +
+                  _frontier_path(problem, relay, goal, depth - relay_depth))
+    node = Node(problem.initial)
+    for state in states[1:]:
+        node = next(child for child in node.expand(problem) if child.state == state)
+    return node
+
+
 # ______________________________________________________________________________
 
 # Code to compare searchers on various problems.
@@ -345,6 +733,12 @@ class InstrumentedProblem(Problem):
     def value(self, state):
         return self.problem.value(state)
 
+    def subgoals(self, condition):
+        self.succs += 1
+        subgoals = self.problem.subgoals(condition)
+        self.states += len(subgoals)
+        return subgoals
+
     def __getattr__(self, attr):
         return getattr(self.problem, attr)
 
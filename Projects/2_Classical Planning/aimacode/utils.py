@@ -10,7 +10,7 @@ import math
 
 import heapq
 from functools import lru_cache
-from collections import namedtuple, deque, Counter, defaultdict
+from collections import namedtuple, deque, defaultdict
 
 # ______________________________________________________________________________
 # Functions on Sequences and Iterables
@@ -361,33 +361,55 @@ class PriorityQueue(Queue):
     order) is returned first.  Also supports dict-like lookup.
 
     MODIFIED FROM AIMA VERSION
-        - Use heapq
-        - Use an additional dict to track membership
+        - Use heapq, breaking ties between equal f values first-in first-out
+        - Use an additional dict from each item to its heap entry, so q[item]
+          returns the item stored in the queue that compares equal to item
+          (e.g. the node for the same state), and appending an item that is
+          already queued replaces it (decrease-key)
+        - Replaced and deleted entries are only marked as removed and are
+          skipped by pop (lazy deletion); the heap is rebuilt without them
+          when they outnumber the queued items
     """
 
-    def __init__(self, order=None, f=lambda x: x):
+    _REMOVED = object()
+
+    def __init__(self, order=min, f=lambda x: x):
         self.A = []
-        self._A = Counter()
-        self.f = f
+        self._entries = {}
+        self._counter = 0
+        self.f = f if order is not max else (lambda x: -f(x))
 
     def append(self, item):
-        heapq.heappush(self.A, (self.f(item), item))
-        self._A[item] += 1
+        old = self._entries.pop(item, None)
+        if old is not None:
+            old[-1] = self._REMOVED
+        entry = [self.f(item), self._counter, item]
+        self._counter += 1
+        self._entries[item] = entry
+        heapq.heappush(self.A, entry)
+        if len(self.A) > 2 * len(self._entries) + 64:
+            self.A = [e for e in self.A if e[-1] is not self._REMOVED]
+            heapq.heapify(self.A)
 
     def __len__(self):
-        return len(self.A)
+        return len(self._entries)
 
     def pop(self):
-        _, item = heapq.heappop(self.A)
-        self._A[item] -= 1
-        return item
+        while self.A:
+            item = heapq.heappop(self.A)[-1]
+            if item is not self._REMOVED:
+                del self._entries[item]
+                return item
+        raise IndexError('pop from an empty priority queue')
 
     def __contains__(self, item):
-        return self._A[item] > 0
+        return item in self._entries
 
     def __getitem__(self, key):
-        if self._A[key] > 0:
-            return key
+        return self._entries[key][-1]
+
+    def __delitem__(self, key):
+        self._entries.pop(key)[-1] = self._REMOVED
 
 # ______________________________________________________________________________
 # Useful Shorthands
@@ -75,7 +75,7 @@ if __name__ == '__main__':
     for f in p.state_map:
         print('   {}'.format(f))
 
-    print("Initial state for this problem is {}".format(p.initial))
+    print("Initial state for this problem is {}".format(p.decode(p.initial).sentence()))
     print("Actions for this domain are:")
     for a in p.actions_list:
         print('   {}{}'.format(a.name, a.args))
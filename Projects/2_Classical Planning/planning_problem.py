@@ -4,7 +4,7 @@ from functools import lru_cache
 from aimacode.logic import PropKB
 from aimacode.search import Node, Problem
 
-from _utils import encode_state, decode_state
+from _utils import encode_bits, decode_bits, fluents_mask
 from my_planning_graph import PlanningGraph
 
     ##############################################################################
@@ -12,12 +12,73 @@ from my_planning_graph import PlanningGraph
     ##############################################################################
 
 
+def _bits(mask):
+    """ The single-bit masks of the bits set in a mask """
+    bits = []
+    while mask:
+        bit = mask & -mask
+        bits.append(bit)
+        mask ^= bit
+    return bits
+
+
 class BasePlanningProblem(Problem):
+    """ States are integer bitsets over `state_map`: bit i is set when the
+    fluent state_map[i] is True (see `_utils.encode_bits`). Each action is
+    compiled into masks of its positive and negative preconditions and of its
+    add and delete effects the first time it is needed, so testing, applying
+    and goal testing an action each take a few integer operations.
+
+    To find the applicable actions without testing all of them, each action is
+    indexed under one of its positive preconditions (its trigger, chosen as
+    the precondition shared by the fewest actions); `actions` only tests the
+    actions indexed under the fluents that are true in the state.
+    """
     def __init__(self, initial, goal):
         self.state_map = sorted(initial.pos + initial.neg, key=str)
-        self.initial_state_TF = encode_state(initial, self.state_map)
+        self.fluent_index = {f: i for i, f in enumerate(self.state_map)}
+        self.initial_state_TF = encode_bits(initial, self.state_map)
+        self.goal_mask = fluents_mask(goal, self.fluent_index)
+        self._action_masks = None
         super().__init__(self.initial_state_TF, goal=goal)
 
+    @property
+    def action_masks(self):
+        """ A list of (precond_pos, precond_neg, effect_add, effect_rem) masks
+        in the order of `actions_list`
+        """
+        if self._action_masks is None:
+            self._compile_actions()
+        return self._action_masks
+
+    def _compile_actions(self):
+        # called on first use, as subclasses build actions_list after __init__
+        index = self.fluent_index
+        self._action_masks = [
+            (fluents_mask(a.precond_pos, index), fluents_mask(a.precond_neg, index),
+             fluents_mask(a.effect_add, index), fluents_mask(a.effect_rem, index))
+            for a in self.actions_list]
+        self._effects = {a: (add, rem) for a, (_, _, add, rem)
+                         in zip(self.actions_list, self._action_masks)}
+
+        # precondition index: trigger bit -> [(action number, pos, neg)]
+        users = {}
+        for k, (pos, neg, _, _) in enumerate(self._action_masks):
+            for bit in _bits(pos):
+                users[bit] = users.get(bit, 0) + 1
+        self._triggers = {}
+        self._untriggered = []
+        for k, (pos, neg, _, _) in enumerate(self._action_masks):
+            if pos:
+                trigger = min(_bits(pos), key=lambda bit: (users[bit], bit))
+                self._triggers.setdefault(trigger, []).append((k, pos, neg))
+            else:
+                self._untriggered.append((k, pos, neg))
+
+    def decode(self, state):
+        """ Return a state as a FluentState of positive and negative fluents """
+        return decode_bits(state, self.state_map)
+
     @lru_cache()
     def h_unmet_goals(self, node):
         """ This heuristic estimates the minimum number of actions that must be
@@ -25,7 +86,7 @@ class BasePlanningProblem(Problem):
         conditions by ignoring the preconditions required for an action to be
         executed.
         """
-        return sum(1 for i, f in enumerate(self.state_map) if not node.state[i] and f in self.goal)
+        return bin(self.goal_mask & ~node.state).count('1')
 
     @lru_cache()
     def h_pg_levelsum(self, node):
@@ -72,32 +133,72 @@ class BasePlanningProblem(Problem):
         return score
 
     def actions(self, state):
-        """ Return the actions that can be executed in the given state. """
-        possible_actions = []
-        fluent = decode_state(state, self.state_map)
-        for action in self.actions_list:
-            is_possible = True
-            for clause in action.precond_pos:
-                if clause not in fluent.pos:
-                    is_possible = False
-                    break
-            if not is_possible: continue
-            for clause in action.precond_neg:
-                if clause not in fluent.neg:
-                    is_possible = False
-                    break
-            if is_possible: possible_actions.append(action)
-        return possible_actions
+        """ Return the actions that can be executed in the given state, in the
+        order of actions_list.
+        """
+        if self._action_masks is None:
+            self._compile_actions()
+        matched = [k for k, _, neg in self._untriggered if not state & neg]
+        triggers = self._triggers
+        rest = state
+        while rest:
+            bit = rest & -rest
+            rest ^= bit
+            for k, pos, neg in triggers.get(bit, ()):
+                if state & pos == pos and not state & neg:
+                    matched.append(k)
+        matched.sort()
+        actions_list = self.actions_list
+        return [actions_list[k] for k in matched]
 
     def result(self, state, action):
         """ Return the state that results from executing the given action in the
         given state. The action must be one of self.actions(state).
         """
-        return tuple([
-            (f and s not in action.effect_rem) or (s in action.effect_add)
-            for f, s in zip(state, self.state_map)
-        ])
+        if self._action_masks is None:
+            self._compile_actions()
+        add, rem = self._effects[action]
+        return state & ~rem | add
 
-    def goal_test(self, state: str) -> bool:
+    def goal_test(self, state: int) -> bool:
         """ Test the state to see if goal is reached """
-        return all(f for f, c in zip(state, self.state_map) if c in self.goal)
+        return state & self.goal_mask == self.goal_mask
+
+    def goal_condition(self):
+        """ Return the goal as a condition for regression search: a pair of
+        masks (pos, neg) of the fluents that must be True and False
+        """
+        return (self.goal_mask, 0)
+
+    def subgoals(self, condition):
+        """ Regress a condition through every action that achieves part of it
+        without undoing the rest, returning (action, condition) pairs: a state
+        that meets the new condition allows the action, and executing it
+        leads to a state that meets the given one.
+        """
+        pos, neg = condition
+        result = []
+        for action, (pre_pos, pre_neg, add, rem) in zip(self.actions_list, self.action_masks):
+            rem = rem & ~add
+            if not (add & pos or rem & neg) or add & neg or rem & pos:
+                continue
+            new_pos = pos & ~add | pre_pos
+            new_neg = neg & ~rem | pre_neg
+            if not new_pos & new_neg:
+                result.append((action, (new_pos, new_neg)))
+        return result
+
+    def satisfies(self, state, condition):
+        """ Test whether a state meets a condition from `subgoals` """
+        pos, neg = condition
+        return state & pos == pos and not state & neg
+
+    def state_features(self, state):
+        """ The single-bit masks of the fluents that are True in a state """
+        return _bits(state)
+
+    def condition_features(self, condition):
+        """ The single-bit masks of the fluents that a condition requires to be
+        True, which every state that meets the condition has
+        """
+        return _bits(condition[0])
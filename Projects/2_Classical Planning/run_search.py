@@ -4,7 +4,8 @@ import argparse
 from aimacode.search import (breadth_first_search, astar_search,
     breadth_first_tree_search, depth_first_graph_search, uniform_cost_search,
     greedy_best_first_graph_search, depth_limited_search,
-    recursive_best_first_search)
+    recursive_best_first_search, ida_star_search, sma_star_search,
+    bidirectional_breadth_first_search, frontier_breadth_first_search)
 from air_cargo_problems import air_cargo_p1, air_cargo_p2, air_cargo_p3, air_cargo_p4
 
 from _utils import run_search
@@ -44,7 +45,12 @@ SEARCHES = [["breadth_first_search", breadth_first_search, ""],
             ['astar_search', astar_search, 'h_unmet_goals'],
             ['astar_search', astar_search, 'h_pg_levelsum'],
             ['astar_search', astar_search, 'h_pg_maxlevel'],
-            ['astar_search', astar_search, 'h_pg_setlevel']
+            ['astar_search', astar_search, 'h_pg_setlevel'],
+            ['recursive_best_first_search', recursive_best_first_search, 'h_unmet_goals'],
+            ['ida_star_search', ida_star_search, 'h_unmet_goals'],
+            ['sma_star_search', sma_star_search, 'h_unmet_goals'],
+            ['bidirectional_breadth_first_search', bidirectional_breadth_first_search, ""],
+            ['frontier_breadth_first_search', frontier_breadth_first_search, ""]
             ]
 
 
@@ -0,0 +1,89 @@
+import unittest
+
+from aimacode.utils import expr
+from _utils import decode_bits, encode_bits, encode_state
+from air_cargo_problems import air_cargo_p1
+from example_have_cake import have_cake
+
+
+class TestBitsetStates(unittest.TestCase):
+    def setUp(self):
+        self.cake_problem = have_cake()
+        self.ac_problem = air_cargo_p1()
+
+    def test_encoding(self):
+        state_map = self.ac_problem.state_map
+        fs = self.ac_problem.decode(self.ac_problem.initial)
+        self.assertEqual(encode_bits(fs, state_map), self.ac_problem.initial)
+        bools = encode_state(fs, state_map)
+        self.assertEqual([bool(self.ac_problem.initial >> i & 1) for i in range(len(state_map))],
+                         list(bools))
+        self.assertEqual(decode_bits(0, state_map).pos, [])
+
+    def test_actions_and_result(self):
+        problem = self.cake_problem
+        state = problem.initial
+        self.assertEqual([a.name for a in problem.actions(state)], ['Eat'])
+        self.assertFalse(problem.goal_test(state))
+        state = problem.result(state, problem.actions(state)[0])
+        self.assertEqual(problem.decode(state).pos, [expr('Eaten(Cake)')])
+        self.assertEqual([a.name for a in problem.actions(state)], ['Bake'])
+        state = problem.result(state, problem.actions(state)[0])
+        self.assertTrue(problem.goal_test(state))
+
+    def test_matches_fluent_semantics(self):
+        problem = self.ac_problem
+        state = problem.initial
+        for _ in range(4):
+            fluent = problem.decode(state)
+            expected = [a for a in problem.actions_list
+                        if all(c in fluent.pos for c in a.precond_pos) and
+                        all(c in fluent.neg for c in a.precond_neg)]
+            self.assertEqual(problem.actions(state), expected)
+            action = expected[-1]
+            pos = (set(fluent.pos) - action.effect_rem) | action.effect_add
+            state = problem.result(state, action)
+            self.assertEqual(set(problem.decode(state).pos), pos)
+
+    def test_subgoals(self):
+        problem = self.ac_problem
+        states, frontier = {problem.initial}, [problem.initial]
+        while frontier:
+            state = frontier.pop()
+            for action in problem.actions(state):
+                child = problem.result(state, action)
+                if child not in states:
+                    states.add(child)
+                    frontier.append(child)
+        goal = problem.goal_condition()
+        self.assertEqual({s for s in states if problem.satisfies(s, goal)},
+                         {s for s in states if problem.goal_test(s)})
+        for condition in [goal] + [c for _, c in problem.subgoals(goal)]:
+            regressed = problem.subgoals(condition)
+            self.assertTrue(regressed)
+            for action, subgoal in regressed:
+                for state in states:
+                    if problem.satisfies(state, subgoal):
+                        self.assertLessEqual(set(problem.condition_features(subgoal)),
+                                             set(problem.state_features(state)))
+                        self.assertIn(action, problem.actions(state))
+                        self.assertTrue(problem.satisfies(problem.result(state, action), condition))
+
+    def test_precondition_index(self):
+        problem = self.ac_problem
+        seen, frontier = {problem.initial}, [problem.initial]
+        while frontier:
+            state = frontier.pop()
+            expected = [a for a, (pos, neg, _, _) in zip(problem.actions_list, problem.action_masks)
+                        if state & pos == pos and not state & neg]
+            self.assertEqual(problem.actions(state), expected)
+            for action in expected:
+                child = problem.result(state, action)
+                if child not in seen:
+                    seen.add(child)
+                    frontier.append(child)
+        self.assertEqual(len(seen), 64)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,95 @@
+import unittest
+
+from aimacode.search import (Node, astar_search, bidirectional_breadth_first_search,
+    breadth_first_search, frontier_breadth_first_search, ida_star_search,
+    recursive_best_first_search, sma_star_search, uniform_cost_search)
+from aimacode.utils import PriorityQueue
+from air_cargo_problems import air_cargo_p1, air_cargo_p2
+from example_have_cake import have_cake
+
+
+class TestPriorityQueue(unittest.TestCase):
+    def test_order(self):
+        q = PriorityQueue(min, lambda x: x % 10)
+        for x in [13, 21, 5, 11, 40]:
+            q.append(x)
+        self.assertEqual([q.pop() for _ in range(len(q))], [40, 21, 11, 13, 5])
+        self.assertRaises(IndexError, q.pop)
+        q = PriorityQueue(max)
+        q.extend([1, 3, 2])
+        self.assertEqual(q.pop(), 3)
+
+    def test_decrease_key(self):
+        q = PriorityQueue(min, lambda node: node.path_cost)
+        far, near = Node('A', path_cost=5), Node('A', path_cost=2)
+        q.append(far)
+        q.append(Node('B', path_cost=3))
+        self.assertIs(q[near], far)
+        del q[far]
+        self.assertNotIn(near, q)
+        q.append(near)
+        self.assertIs(q[Node('A')], near)
+        self.assertEqual(len(q), 2)
+        self.assertEqual([q.pop().state, q.pop().state], ['A', 'B'])
+        self.assertEqual(len(q), 0)
+
+    def test_stale_entries_are_dropped(self):
+        q = PriorityQueue(min, lambda node: node.path_cost)
+        for cost in range(1000, 0, -1):
+            q.append(Node('A', path_cost=cost))
+        self.assertEqual(len(q), 1)
+        self.assertLess(len(q.A), 100)
+        self.assertEqual(q.pop().path_cost, 1)
+
+
+class TestNode(unittest.TestCase):
+    def test_slots(self):
+        problem = air_cargo_p1()
+        root = Node(problem.initial)
+        child = next(root.expand(problem))
+        self.assertFalse(hasattr(child, '__dict__'))
+        self.assertEqual((child.parent, child.depth, child.path_cost), (root, 1, 1))
+        self.assertFalse(hasattr(child, 'f'))
+        child.f = 3
+        self.assertEqual(child.f, 3)
+        self.assertRaises(AttributeError, setattr, child, 'g', 0)
+
+
+class TestSearches(unittest.TestCase):
+    def test_optimal_plan_lengths(self):
+        for make, length in ((air_cargo_p1, 6), (air_cargo_p2, 9)):
+            problem = make()
+            self.assertEqual(len(breadth_first_search(problem).solution()), length)
+            self.assertEqual(len(uniform_cost_search(problem).solution()), length)
+            self.assertEqual(len(astar_search(problem, problem.h_unmet_goals).solution()), length)
+            for search in (bidirectional_breadth_first_search, frontier_breadth_first_search):
+                node = search(problem)
+                self.assertEqual(len(node.solution()), length)
+                self.assertTrue(problem.goal_test(node.state))
+                self.assertEqual(node.path()[0].state, problem.initial)
+
+    def test_linear_memory_searches(self):
+        problem = air_cargo_p1()
+        for search in (recursive_best_first_search, ida_star_search, sma_star_search):
+            self.assertEqual(len(search(problem, problem.h_unmet_goals).solution()), 6)
+
+    def test_sma_star_memory_bound(self):
+        problem = air_cargo_p1()
+        # the plan has 6 actions, so the path to the goal takes 7 nodes
+        for max_nodes in (7, 8, 20, 100):
+            node = sma_star_search(problem, problem.h_unmet_goals, max_nodes)
+            self.assertEqual(len(node.solution()), 6)
+        self.assertIsNone(sma_star_search(problem, problem.h_unmet_goals, 6))
+        problem = air_cargo_p2()
+        node = sma_star_search(problem, problem.h_unmet_goals, 2000)
+        self.assertEqual(len(node.solution()), 9)
+
+    def test_breadth_first_variants_short_plans(self):
+        problem = have_cake()
+        for search in (bidirectional_breadth_first_search, frontier_breadth_first_search):
+            self.assertEqual([a.name for a in search(problem).solution()], ['Eat', 'Bake'])
+        self.assertIsNone(frontier_breadth_first_search(problem, limit=1))
+
+
+if __name__ == '__main__':
+    unittest.main()